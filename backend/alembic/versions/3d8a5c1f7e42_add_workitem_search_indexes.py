@@ -0,0 +1,61 @@
+"""Add GIN indexes for workitem full-text and containment search
+
+Revision ID: 3d8a5c1f7e42
+Revises: b7e4f1a9c2d6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d8a5c1f7e42"
+down_revision: Union[str, None] = "b7e4f1a9c2d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Same expression as WORKITEM_SEARCH_VECTOR in workqueue_repository
+        op.create_index(
+            "ix_workitem_search",
+            "workitem",
+            [
+                sa.text(
+                    "(to_tsvector('simple'::regconfig, coalesce(reference, '')) || "
+                    "jsonb_to_tsvector('simple'::regconfig, data, "
+                    '\'["string", "numeric"]\'::jsonb))'
+                )
+            ],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_workitem_data",
+            "workitem",
+            ["data"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_data",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_workitem_search",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
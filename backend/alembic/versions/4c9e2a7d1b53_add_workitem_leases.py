@@ -0,0 +1,37 @@
+"""Add work item leases
+
+Revision ID: 4c9e2a7d1b53
+Revises: e7c1f0a2b9d4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c9e2a7d1b53"
+down_revision: Union[str, None] = "e7c1f0a2b9d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workqueue", sa.Column("lease_seconds", sa.Integer(), nullable=True))
+    op.add_column("workitem", sa.Column("lease_until", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_workitem_lease_until",
+        "workitem",
+        ["lease_until"],
+        unique=False,
+        postgresql_where=sa.text("lease_until IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_workitem_lease_until", table_name="workitem")
+    op.drop_column("workitem", "lease_until")
+    op.drop_column("workqueue", "lease_seconds")
@@ -0,0 +1,111 @@
+"""Add trigger-maintained workqueue item counters
+
+Revision ID: 5a1d7c3e9f20
+Revises: 8f3b6d0e2a91
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a1d7c3e9f20"
+down_revision: Union[str, None] = "8f3b6d0e2a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers with transition tables: one counter upsert per
+# statement, however many rows it touched. Deltas are applied in key order so
+# concurrent statements lock counter rows in the same order.
+COUNT_FUNCTION = """
+CREATE FUNCTION workqueueitemcount_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, count(*) FROM new_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, -count(*) FROM old_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, sum(delta) FROM (
+            SELECT workqueue_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT workqueue_id, status, -1 AS delta FROM old_rows
+        ) AS deltas
+        GROUP BY workqueue_id, status
+        HAVING sum(delta) <> 0
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = {
+    "workitem_count_insert": (
+        "AFTER INSERT ON workitem REFERENCING NEW TABLE AS new_rows"
+    ),
+    "workitem_count_update": (
+        "AFTER UPDATE ON workitem "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "workitem_count_delete": (
+        "AFTER DELETE ON workitem REFERENCING OLD TABLE AS old_rows"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workqueueitemcount",
+        sa.Column("workqueue_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="workitemstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["workqueue_id"], ["workqueue.id"]),
+        sa.PrimaryKeyConstraint("workqueue_id", "status"),
+    )
+
+    # Block writes while backfilling so no change slips between the snapshot
+    # and the triggers going live.
+    op.execute("LOCK TABLE workitem IN SHARE MODE")
+    op.execute(COUNT_FUNCTION)
+    for name, definition in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {definition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION workqueueitemcount_apply()"
+        )
+    op.execute(
+        """
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, count(*) FROM workitem
+        GROUP BY workqueue_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON workitem")
+    op.execute("DROP FUNCTION workqueueitemcount_apply()")
+    op.drop_table("workqueueitemcount")
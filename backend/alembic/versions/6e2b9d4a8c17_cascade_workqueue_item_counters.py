@@ -0,0 +1,46 @@
+"""Cascade workqueue deletes to workqueueitemcount
+
+Revision ID: 6e2b9d4a8c17
+Revises: 3d8a5c1f7e42
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2b9d4a8c17"
+down_revision: Union[str, None] = "3d8a5c1f7e42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a queue's items leaves zeroed counter rows behind; they must
+    # not block deleting the queue itself.
+    op.drop_constraint(
+        "workqueueitemcount_workqueue_id_fkey", "workqueueitemcount", type_="foreignkey"
+    )
+    op.create_foreign_key(
+        "workqueueitemcount_workqueue_id_fkey",
+        "workqueueitemcount",
+        "workqueue",
+        ["workqueue_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "workqueueitemcount_workqueue_id_fkey", "workqueueitemcount", type_="foreignkey"
+    )
+    op.create_foreign_key(
+        "workqueueitemcount_workqueue_id_fkey",
+        "workqueueitemcount",
+        "workqueue",
+        ["workqueue_id"],
+        ["id"],
+    )
@@ -0,0 +1,42 @@
+"""Add partial index for the workitem dequeue query
+
+Revision ID: 8f3b6d0e2a91
+Revises: 4c9e2a7d1b53
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3b6d0e2a91"
+down_revision: Union[str, None] = "4c9e2a7d1b53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches get_next_items: claimable rows of one queue in created_at order,
+    # so the oldest NEW item is the first index entry instead of a sort.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_dequeue",
+            "workitem",
+            ["workqueue_id", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'NEW' AND locked = false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_dequeue",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,39 @@
+"""Add workitem(workqueue_id, reference) index
+
+Revision ID: 9c4e1b7a3f58
+Revises: 6e2b9d4a8c17
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e1b7a3f58"
+down_revision: Union[str, None] = "6e2b9d4a8c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ix_workitem_reference (initial migration) serves lookups across queues;
+    # this one serves the per-queue by_reference/by_references lookups.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_workqueue_id_reference",
+            "workitem",
+            ["workqueue_id", "reference"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_workqueue_id_reference",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,61 @@
+"""Add priority to workitem
+
+Revision ID: a3c7e9f1d2b8
+Revises: f2a6c8e4b1d9
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c7e9f1d2b8"
+down_revision: Union[str, None] = "f2a6c8e4b1d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default makes this a catalog-only change, without a rewrite
+    op.add_column(
+        "workitem",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Replaces ix_workitem_dequeue: matches the (priority desc, created_at)
+    # order of get_next_items, so the next item is still the first index entry
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_dequeue_priority",
+            "workitem",
+            ["workqueue_id", sa.text("priority DESC"), "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'NEW' AND locked = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_workitem_dequeue",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_dequeue",
+            "workitem",
+            ["workqueue_id", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'NEW' AND locked = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_workitem_dequeue_priority",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("workitem", "priority")
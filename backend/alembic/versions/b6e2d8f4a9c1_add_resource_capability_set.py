@@ -0,0 +1,59 @@
+"""Add generated, GIN indexed resource.capability_set
+
+Revision ID: b6e2d8f4a9c1
+Revises: f7a3d5b9c2e4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e2d8f4a9c1"
+down_revision: Union[str, None] = "f7a3d5b9c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same split as parse_capabilities_or_requirements. Generated, so every
+    # write path (enroll, updates, existing rows) keeps it in sync
+    op.add_column(
+        "resource",
+        sa.Column(
+            "capability_set",
+            postgresql.ARRAY(sa.Text()),
+            sa.Computed(
+                "array_remove(regexp_split_to_array(btrim(capabilities), '[ ,]+'), '')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    # Serves capability_set @> requirements in ResourceRepository
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_resource_capability_set",
+            "resource",
+            ["capability_set"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_resource_capability_set",
+            table_name="resource",
+            postgresql_concurrently=True,
+        )
+
+    op.drop_column("resource", "capability_set")
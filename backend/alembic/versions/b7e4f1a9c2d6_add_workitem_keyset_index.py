@@ -0,0 +1,38 @@
+"""Add index for keyset pagination of workitems
+
+Revision ID: b7e4f1a9c2d6
+Revises: 5a1d7c3e9f20
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4f1a9c2d6"
+down_revision: Union[str, None] = "5a1d7c3e9f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves GET /workqueues/{id}/items ordered by (updated_at desc, id desc)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_workqueue_id_updated_at_id",
+            "workitem",
+            ["workqueue_id", "updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_workqueue_id_updated_at_id",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
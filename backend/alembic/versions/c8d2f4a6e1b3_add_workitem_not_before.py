@@ -0,0 +1,73 @@
+"""Add not_before to workitem
+
+Revision ID: c8d2f4a6e1b3
+Revises: a3c7e9f1d2b8
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d2f4a6e1b3"
+down_revision: Union[str, None] = "a3c7e9f1d2b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workitem", sa.Column("not_before", sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        # Delayed items stay out of the dequeue index until they are released,
+        # so they are never scanned past when claiming the next item
+        op.create_index(
+            "ix_workitem_dequeue_ready",
+            "workitem",
+            ["workqueue_id", sa.text("priority DESC"), "created_at"],
+            unique=False,
+            postgresql_where=sa.text(
+                "status = 'NEW' AND locked = false AND not_before IS NULL"
+            ),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_workitem_dequeue_priority",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+        # Finds the delayed items that are due
+        op.create_index(
+            "ix_workitem_not_before",
+            "workitem",
+            ["workqueue_id", "not_before"],
+            unique=False,
+            postgresql_where=sa.text("not_before IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_not_before",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_workitem_dequeue_priority",
+            "workitem",
+            ["workqueue_id", sa.text("priority DESC"), "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'NEW' AND locked = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_workitem_dequeue_ready",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("workitem", "not_before")
@@ -0,0 +1,47 @@
+"""Add idempotency_key to workitem
+
+Revision ID: d5a7e3c9b184
+Revises: 9c4e1b7a3f58
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a7e3c9b184"
+down_revision: Union[str, None] = "9c4e1b7a3f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workitem",
+        sa.Column("idempotency_key", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    # Arbiter for INSERT ... ON CONFLICT DO NOTHING in create_idempotent
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ux_workitem_workqueue_id_idempotency_key",
+            "workitem",
+            ["workqueue_id", "idempotency_key"],
+            unique=True,
+            postgresql_where=sa.text("idempotency_key IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ux_workitem_workqueue_id_idempotency_key",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("workitem", "idempotency_key")
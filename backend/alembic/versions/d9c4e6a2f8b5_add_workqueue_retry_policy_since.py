@@ -0,0 +1,38 @@
+"""Add retry_policy_since to workqueue
+
+Revision ID: d9c4e6a2f8b5
+Revises: b6e2d8f4a9c1
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9c4e6a2f8b5"
+down_revision: Union[str, None] = "b6e2d8f4a9c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workqueue", sa.Column("retry_policy_since", sa.DateTime(), nullable=True)
+    )
+    # Queues that already retry keep retrying new failures only; timestamps
+    # are naive local time like the rest of the schema
+    op.execute(
+        sa.text(
+            "UPDATE workqueue SET retry_policy_since = :now "
+            "WHERE max_attempts IS NOT NULL"
+        ).bindparams(now=datetime.now())
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workqueue", "retry_policy_since")
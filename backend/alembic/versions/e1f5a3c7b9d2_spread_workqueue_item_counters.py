@@ -0,0 +1,138 @@
+"""Spread workqueue item counters over slots
+
+Revision ID: e1f5a3c7b9d2
+Revises: d9c4e6a2f8b5
+Create Date: 2026-10-17 00:00:00.000000
+
+Every enqueue, claim and status change upserts its queue's counter rows and
+holds their lock until commit, so concurrent writers on one queue serialised
+on them. Each statement now adds its deltas to one of COUNTER_SLOTS rows per
+(workqueue_id, status), picked at random; readers sum the slots.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f5a3c7b9d2"
+down_revision: Union[str, None] = "d9c4e6a2f8b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_SLOTS = 16
+
+# Same as in 5a1d7c3e9f20, with the slot added to every upsert. Deltas are
+# still applied in key order so concurrent statements lock rows in order.
+COUNT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION workqueueitemcount_apply() RETURNS trigger AS $$
+DECLARE
+    target_slot smallint := floor(random() * {COUNTER_SLOTS});
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, slot, count)
+        SELECT workqueue_id, status, target_slot, count(*) FROM new_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status, slot)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, slot, count)
+        SELECT workqueue_id, status, target_slot, -count(*) FROM old_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status, slot)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO workqueueitemcount (workqueue_id, status, slot, count)
+        SELECT workqueue_id, status, target_slot, sum(delta) FROM (
+            SELECT workqueue_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT workqueue_id, status, -1 AS delta FROM old_rows
+        ) AS deltas
+        GROUP BY workqueue_id, status
+        HAVING sum(delta) <> 0
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status, slot)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+UNSLOTTED_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION workqueueitemcount_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, count(*) FROM new_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, -count(*) FROM old_rows
+        GROUP BY workqueue_id, status
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO workqueueitemcount (workqueue_id, status, count)
+        SELECT workqueue_id, status, sum(delta) FROM (
+            SELECT workqueue_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT workqueue_id, status, -1 AS delta FROM old_rows
+        ) AS deltas
+        GROUP BY workqueue_id, status
+        HAVING sum(delta) <> 0
+        ORDER BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # Existing counts become slot 0
+    op.add_column(
+        "workqueueitemcount",
+        sa.Column("slot", sa.SmallInteger(), server_default="0", nullable=False),
+    )
+    op.drop_constraint("workqueueitemcount_pkey", "workqueueitemcount")
+    op.create_primary_key(
+        "workqueueitemcount_pkey",
+        "workqueueitemcount",
+        ["workqueue_id", "status", "slot"],
+    )
+    op.execute(COUNT_FUNCTION)
+
+
+def downgrade() -> None:
+    # Keep writers out while the slots are folded into slot 0
+    op.execute("LOCK TABLE workqueueitemcount IN EXCLUSIVE MODE")
+    op.execute(
+        """
+        WITH folded AS (
+            DELETE FROM workqueueitemcount WHERE slot <> 0
+            RETURNING workqueue_id, status, count
+        )
+        INSERT INTO workqueueitemcount (workqueue_id, status, slot, count)
+        SELECT workqueue_id, status, 0, sum(count) FROM folded
+        GROUP BY workqueue_id, status
+        ON CONFLICT (workqueue_id, status, slot)
+        DO UPDATE SET count = workqueueitemcount.count + EXCLUDED.count
+        """
+    )
+    op.drop_constraint("workqueueitemcount_pkey", "workqueueitemcount")
+    op.drop_column("workqueueitemcount", "slot")
+    op.create_primary_key(
+        "workqueueitemcount_pkey", "workqueueitemcount", ["workqueue_id", "status"]
+    )
+    op.execute(UNSLOTTED_COUNT_FUNCTION)
@@ -0,0 +1,55 @@
+"""Add retry policy to workqueue and attempts to workitem
+
+Revision ID: e4b9a1c7d3f6
+Revises: c8d2f4a6e1b3
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b9a1c7d3f6"
+down_revision: Union[str, None] = "c8d2f4a6e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workqueue", sa.Column("max_attempts", sa.Integer(), nullable=True))
+    op.add_column(
+        "workqueue",
+        sa.Column(
+            "retry_backoff_seconds", sa.Integer(), nullable=False, server_default="60"
+        ),
+    )
+    op.add_column(
+        "workitem",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # retry_failed_items reads only the failed items with attempts left
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workitem_retry",
+            "workitem",
+            ["workqueue_id", "attempts"],
+            unique=False,
+            postgresql_where=sa.text("status = 'FAILED'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workitem_retry",
+            table_name="workitem",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("workitem", "attempts")
+    op.drop_column("workqueue", "retry_backoff_seconds")
+    op.drop_column("workqueue", "max_attempts")
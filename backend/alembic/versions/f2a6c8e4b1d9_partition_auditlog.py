@@ -0,0 +1,92 @@
+"""Partition auditlog by created_at (opt-in)
+
+Revision ID: f2a6c8e4b1d9
+Revises: d5a7e3c9b184
+Create Date: 2026-10-17 00:00:00.000000
+
+Upgrading changes nothing: the table is converted by the explicit
+
+    python -m app.database.partitioning auditlog
+
+so the layout never depends on settings at the time this revision runs.
+Downgrading collapses a converted table back into a regular one, as the
+earlier revisions expect.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6c8e4b1d9"
+down_revision: Union[str, None] = "d5a7e3c9b184"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_partitioned() -> bool:
+    return (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass('auditlog'))"
+            )
+        )
+        .scalar_one()
+    )
+
+
+def _table_definition(table: str, skip: list[str]):
+    bind = op.get_bind()
+    sequence = bind.execute(
+        sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")
+    ).scalar_one()
+    indexes = bind.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND NOT indexname = ANY(:skip)"
+        ),
+        {"table": table, "skip": skip},
+    ).all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+    return sequence, indexes, foreign_keys
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    if not _is_partitioned():
+        return
+
+    # Collapse the partitions back into a regular table
+    sequence, indexes, foreign_keys = _table_definition("auditlog", ["auditlog_pkey"])
+
+    op.execute("ALTER TABLE auditlog RENAME TO auditlog_partitioned")
+    op.execute(
+        "ALTER TABLE auditlog_partitioned "
+        "RENAME CONSTRAINT auditlog_pkey TO auditlog_partitioned_pkey"
+    )
+    for name, _ in indexes:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+
+    op.execute("CREATE TABLE auditlog (LIKE auditlog_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO auditlog SELECT * FROM auditlog_partitioned")
+    op.execute("ALTER TABLE auditlog ADD CONSTRAINT auditlog_pkey PRIMARY KEY (id)")
+    for _, definition in indexes:
+        op.execute(definition)
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE auditlog ADD CONSTRAINT {name} {definition}")
+
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY auditlog.id")
+    op.execute("DROP TABLE auditlog_partitioned")
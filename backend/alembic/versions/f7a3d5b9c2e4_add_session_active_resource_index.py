@@ -0,0 +1,42 @@
+"""Add partial index on active sessions per resource
+
+Revision ID: f7a3d5b9c2e4
+Revises: e4b9a1c7d3f6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a3d5b9c2e4"
+down_revision: Union[str, None] = "e4b9a1c7d3f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the anti-join in ResourceRepository.get_available_resources; only
+    # the few unfinished sessions are indexed, not the whole history
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_session_active_resource_id",
+            "session",
+            ["resource_id"],
+            unique=False,
+            postgresql_where=sa.text("status IN ('NEW', 'IN_PROGRESS')"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_session_active_resource_id",
+            table_name="session",
+            postgresql_concurrently=True,
+        )
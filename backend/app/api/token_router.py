@@ -17,13 +17,9 @@ async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     repository: AccessTokenRepository = Depends(get_repository(AccessToken)),
 ):
-    tokens = await repository.get_all()
+    token = await repository.get_by_token(form_data.password)
 
-    if form_data.password in [
-        token.access_token
-        for token in tokens
-        if not token.deleted and token.expires_at > datetime.now()
-    ]:
+    if token is not None and not token.deleted and token.expires_at > datetime.now():
         return {"access_token": form_data.password, "token_type": "bearer"}
 
     raise HTTPException(status_code=400, detail="Incorrect username or password")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.database.models import AccessToken
 from app.database.repository import AccessTokenRepository
+from app.security import access_token_cache
 
 from .dependencies import get_repository, resolve_access_token
 from .schemas import AccessTokenCreate, AccessTokenRead
@@ -44,7 +45,9 @@ async def create_access_token(
     repository: AccessTokenRepository = Depends(get_repository(AccessToken)),
     token: AccessToken = Depends(resolve_access_token),
 ) -> AccessToken:
-    return await repository.create(identifier.identifier)
+    access_token = await repository.create(identifier.identifier)
+    access_token_cache.clear()
+    return access_token
 
 
 @router.delete("/{access_token_id}")
@@ -71,6 +74,7 @@ async def delete_access_token(
         )
 
     await repository.delete(access_token)
+    access_token_cache.clear()
 
     # Return 204
     return Response(status_code=204)
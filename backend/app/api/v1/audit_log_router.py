@@ -47,6 +47,7 @@ async def get_auditlogs(
         paginated_search.pagination.page,
         paginated_search.pagination.size,
         paginated_search.search,
+        paginated_search.total,
     )
 
 
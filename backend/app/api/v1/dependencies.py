@@ -11,7 +11,8 @@ import app.database.models as models
 import app.database.repository as repositories
 from app.database.session import get_session
 from app.database.unit_of_work import AbstractUnitOfWork, UnitOfWork
-from app.security import oauth2_scheme
+from app.enums import TotalCount
+from app.security import access_token_cache, oauth2_scheme
 from app.services import (
     AuditLogService,
     IncidentService,
@@ -63,8 +64,11 @@ async def get_workqueue_service(
     repository: repositories.WorkqueueRepository = Depends(
         get_repository(models.Workqueue)
     ),
+    work_item_repository: repositories.WorkItemRepository = Depends(
+        get_repository(models.WorkItem)
+    ),
 ) -> WorkqueueService:
-    return WorkqueueService(repository)
+    return WorkqueueService(repository, work_item_repository)
 
 
 async def get_auditlog_service(
@@ -123,9 +127,16 @@ def get_paginated_search_params(
     page: int = Query(1, ge=1, description="Page number, starting from 1"),
     size: int = Query(50, ge=1, le=200, description="Number of items per page"),
     search: Optional[str] = Query(None, description="Search term"),
+    total: TotalCount = Query(
+        TotalCount.EXACT,
+        description="exact counts every request, estimated reuses a recent "
+        "count, none skips counting",
+    ),
 ) -> schemas.PaginatedSearchParams:
     pagination = schemas.PaginationParams(page=page, size=size)
-    return schemas.PaginatedSearchParams(pagination=pagination, search=search)
+    return schemas.PaginatedSearchParams(
+        pagination=pagination, search=search, total=total
+    )
 
 
 logger = logging.getLogger(__name__)
@@ -146,16 +157,41 @@ def _warn_auth_bypass() -> None:
         )
 
 
+async def _is_auth_enforced(repository: repositories.AccessTokenRepository) -> bool:
+    enforced = access_token_cache.get_auth_enforced()
+    if enforced is None:
+        enforced = await repository.has_active_tokens()
+        access_token_cache.set_auth_enforced(enforced)
+    return enforced
+
+
+async def _lookup_access_token(
+    token: str, repository: repositories.AccessTokenRepository
+) -> models.AccessToken | None:
+    access_token = access_token_cache.get(token)
+    if access_token is not None:
+        return access_token
+
+    access_token = await repository.get_by_token(token)
+    if (
+        access_token is None
+        or access_token.deleted
+        or access_token.expires_at <= datetime.now()
+    ):
+        return None
+
+    access_token_cache.put(access_token)
+    return access_token
+
+
 async def resolve_access_token(
     token: str = Depends(oauth2_scheme),
     repository: repositories.AccessTokenRepository = Depends(
         get_repository(models.AccessToken)
     ),
 ) -> models.AccessToken:
-    tokens = await repository.get_all()
-
     # If there are no tokens in the system, we assume that we are in either install or development mode.
-    if len(tokens) == 0:
+    if not await _is_auth_enforced(repository):
         _warn_auth_bypass()
         return models.AccessToken(
             id=0,
@@ -172,16 +208,15 @@ async def resolve_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check if the token is in the tokens
-    for t in tokens:
-        if t.access_token == token and not t.deleted and t.expires_at > datetime.now():
-            return t
+    access_token = await _lookup_access_token(token, repository)
+    if access_token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or expired token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return access_token
 
 
 async def get_unit_of_work(
@@ -5,7 +5,7 @@ from fastapi.exceptions import HTTPException
 
 from app.database.models import AccessToken, Incident
 from app.database.unit_of_work import AbstractUnitOfWork
-from app.enums import IncidentStatus
+from app.enums import IncidentStatus, TotalCount
 from app.services import IncidentService
 
 from . import error_descriptions
@@ -40,10 +40,11 @@ async def list_incidents(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=200),
     search: Optional[str] = Query(None, description="Search by process name"),
+    total: TotalCount = Query(TotalCount.EXACT, description="How to count total"),
     service: IncidentService = Depends(get_incident_service),
     token: AccessToken = Depends(resolve_access_token),
 ) -> PaginatedResponse[Incident]:
-    return await service.search_incidents(page, size, search, status)
+    return await service.search_incidents(page, size, search, status, total)
 
 
 @router.get("/open", responses=error_descriptions("Incident", _403=True))
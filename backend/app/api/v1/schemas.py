@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 import shlex
 from datetime import datetime
 from typing import Any, Dict, Generic, List, Optional, TypeVar
@@ -18,6 +21,11 @@ class WorkqueueUpdate(BaseModel):
     description: str
     enabled: bool
     auto_clean_max_age_days: Optional[int] = Field(default=None, ge=1)
+    lease_seconds: Optional[int] = Field(default=None, ge=1)
+    # Failed items are retried until they have been dequeued max_attempts times.
+    # Only items that fail after max_attempts is enabled are retried.
+    max_attempts: Optional[int] = Field(default=None, ge=1)
+    retry_backoff_seconds: int = Field(default=60, ge=1)
 
 
 class WorkqueueCreate(BaseModel):
@@ -25,6 +33,11 @@ class WorkqueueCreate(BaseModel):
     description: str
     enabled: bool
     auto_clean_max_age_days: Optional[int] = Field(default=None, ge=1)
+    lease_seconds: Optional[int] = Field(default=None, ge=1)
+    # Failed items are retried until they have been dequeued max_attempts times.
+    # Only items that fail after max_attempts is enabled are retried.
+    max_attempts: Optional[int] = Field(default=None, ge=1)
+    retry_backoff_seconds: int = Field(default=60, ge=1)
 
 
 class WorkqueueInformation(BaseModel):
@@ -33,6 +46,9 @@ class WorkqueueInformation(BaseModel):
     description: str
     enabled: bool
     auto_clean_max_age_days: Optional[int] = None
+    lease_seconds: Optional[int] = None
+    max_attempts: Optional[int] = None
+    retry_backoff_seconds: int = 60
     new: int
     in_progress: int
     completed: int
@@ -50,14 +66,46 @@ class ProcessActivitySummary(BaseModel):
     last_activity: datetime
 
 
+# Range of the integer workitem.priority column
+PRIORITY_MIN = -(2**31)
+PRIORITY_MAX = 2**31 - 1
+MAX_REQUEUE_DELAY = 60 * 60 * 24 * 365
+
+
 class WorkItemCreate(BaseModel):
     data: Dict = {}
     reference: Optional[str] = ""
+    priority: int = Field(
+        0,
+        ge=PRIORITY_MIN,
+        le=PRIORITY_MAX,
+        description="Higher priorities are dequeued first; FIFO within a priority",
+    )
+    not_before: Optional[datetime] = Field(
+        None, description="The item is not dequeued before this time"
+    )
+
+    @field_validator("not_before")
+    @classmethod
+    def validate_not_before(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Timestamps are stored as naive local time, like created_at
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+
+class WorkItemEnqueue(WorkItemCreate):
+    idempotency_key: str = Field(
+        min_length=1,
+        max_length=255,
+        description="Unique per workqueue; repeating it returns the existing item",
+    )
 
 
 class WorkItemUpdate(BaseModel):
     data: Optional[Dict] = None
     reference: Optional[str] = None
+    priority: Optional[int] = Field(None, ge=PRIORITY_MIN, le=PRIORITY_MAX)
 
 
 class WorkItemStatusUpdate(BaseModel):
@@ -65,6 +113,17 @@ class WorkItemStatusUpdate(BaseModel):
     message: Optional[str] = None
 
 
+class WorkItemBulkStatusUpdate(WorkItemStatusUpdate):
+    id: int
+
+
+class WorkItemRequeue(BaseModel):
+    delay_seconds: int = Field(
+        0, ge=0, le=MAX_REQUEUE_DELAY, description="Hide the item for this long"
+    )
+    message: Optional[str] = None
+
+
 class WorkItemRead(BaseModel):
     id: int
     data: Dict
@@ -75,10 +134,32 @@ class WorkItemRead(BaseModel):
     workqueue_id: int
     started_at: datetime | None
     work_duration_seconds: int | None
+    lease_until: datetime | None
+    idempotency_key: str | None
+    priority: int
+    not_before: datetime | None
+    attempts: int
     created_at: datetime
     updated_at: datetime
 
 
+class WorkItemEnqueueResult(BaseModel):
+    created: bool
+    item: WorkItemRead
+
+
+class WorkItemImportError(BaseModel):
+    line: int
+    error: str
+
+
+class WorkItemImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    # Only the first MAX_IMPORT_ERRORS failures are listed
+    errors: list[WorkItemImportError] = []
+
+
 class ProcessCreate(BaseModel):
     name: str
     description: Optional[str] = ""
@@ -265,6 +346,7 @@ class SearchParams(BaseModel):
 class PaginatedSearchParams(BaseModel):
     pagination: PaginationParams
     search: Optional[str]
+    total: enums.TotalCount = enums.TotalCount.EXACT
 
 
 T = TypeVar("T")
@@ -273,9 +355,36 @@ T = TypeVar("T")
 class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
-    total_items: int
-    total_pages: int
+    total_items: Optional[int] = Field(
+        description="Matching items; null when requested with total=none"
+    )
+    total_pages: Optional[int]
+    total_estimated: bool = Field(
+        False, description="total_items may be up to a few seconds stale"
+    )
     items: List[T]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `after` to fetch the next page by keyset"
+    )
+
+
+class KeysetCursor(BaseModel):
+    """Position in a listing ordered by (updated_at desc, id desc)."""
+
+    updated_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        payload = json.dumps({"u": self.updated_at.isoformat(), "i": self.id})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "KeysetCursor":
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return cls(updated_at=payload["u"], id=payload["i"])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValueError("Invalid pagination cursor")
 
 
 class WorkqueueClear(BaseModel):
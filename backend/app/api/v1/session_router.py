@@ -61,6 +61,7 @@ async def get_sessions(
         paginated_search.pagination.size,
         paginated_search.search,
         include_deleted,
+        paginated_search.total,
     )
 
 
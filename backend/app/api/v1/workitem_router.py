@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query
 from fastapi.exceptions import HTTPException
 
 from app.database.models import AccessToken, WorkItem
@@ -8,10 +8,18 @@ from app.database.unit_of_work import AbstractUnitOfWork
 from app.enums import WorkItemStatus
 
 from .dependencies import get_unit_of_work, resolve_access_token
-from .schemas import WorkItemRead, WorkItemStatusUpdate, WorkItemUpdate
+from .schemas import (
+    WorkItemBulkStatusUpdate,
+    WorkItemRead,
+    WorkItemRequeue,
+    WorkItemStatusUpdate,
+    WorkItemUpdate,
+)
 
 router = APIRouter(prefix="/workitems", tags=["Workitems"])
 
+MAX_BULK_STATUS_UPDATE = 10_000
+
 # Dependency Injection local to this router
 
 
@@ -37,6 +45,38 @@ RESPONSE_STATES = {
 }
 
 
+@router.put(
+    "/status",
+    responses={
+        400: {"description": "An item is listed more than once"},
+        404: {"description": "One or more workitems not found"},
+    },
+    response_model=list[WorkItemRead],
+)
+async def update_workitem_statuses(
+    changes: list[WorkItemBulkStatusUpdate] = Body(
+        min_length=1, max_length=MAX_BULK_STATUS_UPDATE
+    ),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> list[WorkItem]:
+    """Set the status of many items in one transaction; all or nothing.
+
+    Applies the same rules as `PUT /workitems/{item_id}/status` to each item.
+    Returns the updated items in no particular order.
+    """
+    if len({change.id for change in changes}) != len(changes):
+        raise HTTPException(status_code=400, detail="Duplicate workitem ids")
+
+    async with uow:
+        try:
+            return await uow.work_items.update_statuses(
+                [change.model_dump() for change in changes]
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/{item_id}", responses=RESPONSE_STATES, response_model=WorkItemRead)
 async def get_workitem(
     workitem: WorkItem = Depends(get_workitem),
@@ -57,6 +97,8 @@ async def update_workitem(
         # Filter out None values for non-nullable fields
         if update_data.get("data") is None:
             update_data.pop("data", None)
+        if update_data.get("priority") is None:
+            update_data.pop("priority", None)
         return await uow.work_items.update(workitem, update_data)
 
 
@@ -90,10 +132,53 @@ async def update_workitem_status(
             WorkItemStatus.PENDING_USER_ACTION,
         ]:
             data["locked"] = False
+            data["lease_until"] = None
 
         return await uow.work_items.update(workitem, data)
 
 
+@router.put(
+    "/{item_id}/requeue", responses=RESPONSE_STATES, response_model=WorkItemRead
+)
+async def requeue_workitem(
+    requeue: WorkItemRequeue,
+    workitem: WorkItem = Depends(get_workitem),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> WorkItem:
+    """Put the item back in its queue, not to be dequeued for `delay_seconds`.
+
+    Use this to retry an item later instead of re-adding it, which would make
+    it available again right away.
+    """
+    async with uow:
+        return await uow.work_items.requeue(
+            workitem, requeue.delay_seconds, requeue.message
+        )
+
+
+@router.put(
+    "/{item_id}/heartbeat",
+    responses=RESPONSE_STATES | {409: {"description": "Workitem is not in progress"}},
+    response_model=WorkItemRead,
+)
+async def heartbeat_workitem(
+    workitem: WorkItem = Depends(get_workitem),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> WorkItem:
+    """Extend the lease on an in-progress item by its workqueue's lease length."""
+    if workitem.status != WorkItemStatus.IN_PROGRESS:
+        raise HTTPException(status_code=409, detail="Workitem is not in progress")
+
+    async with uow:
+        workqueue = await uow.workqueues.get(workitem.workqueue_id)
+        if workqueue.lease_seconds is None:
+            return workitem
+
+        return await uow.work_items.extend_lease(workitem, workqueue.lease_seconds)
+
+
 @router.get("/by-reference/{reference}", response_model=list[WorkItemRead])
 async def get_workitems_by_reference(
     reference: str,
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, Query, Response
+import asyncio
+from datetime import datetime
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 
 import app.enums as enums
 from app.api.v1.schemas import PaginatedResponse
 from app.database.models import AccessToken, WorkItem, Workqueue
 from app.database.unit_of_work import AbstractUnitOfWork
+from app.database.workqueue_notifier import workqueue_notifier
 from app.services import WorkqueueService
 
 from .dependencies import (
@@ -17,6 +22,10 @@ from .dependencies import (
 from .schemas import (
     PaginatedSearchParams,
     WorkItemCreate,
+    WorkItemEnqueue,
+    WorkItemEnqueueResult,
+    WorkItemImportResult,
+    WorkItemRead,
     WorkqueueClear,
     WorkqueueCreate,
     WorkqueueInformation,
@@ -25,6 +34,11 @@ from .schemas import (
 
 router = APIRouter(prefix="/workqueues", tags=["Workqueues"])
 
+MAX_BATCH_SIZE = 10_000
+MAX_LEASE_COUNT = 100
+MAX_WAIT_SECONDS = 30
+MAX_REFERENCE_LOOKUP = 1_000
+
 
 # Dependency Injection local to this router
 async def get_workqueue(
@@ -89,6 +103,9 @@ async def get_workqueues_information(
                 description=queue.description,
                 enabled=queue.enabled,
                 auto_clean_max_age_days=queue.auto_clean_max_age_days,
+                lease_seconds=queue.lease_seconds,
+                max_attempts=queue.max_attempts,
+                retry_backoff_seconds=queue.retry_backoff_seconds,
                 new=counts.get(enums.WorkItemStatus.NEW, 0),
                 in_progress=counts.get(enums.WorkItemStatus.IN_PROGRESS, 0),
                 completed=counts.get(enums.WorkItemStatus.COMPLETED, 0),
@@ -186,8 +203,65 @@ async def adds_workitem(
         return await uow.work_items.create(data)
 
 
+@router.post("/{workqueue_id}/enqueue")
+async def enqueues_workitem(
+    item: WorkItemEnqueue,
+    workqueue: Workqueue = Depends(get_workqueue),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> WorkItemEnqueueResult:
+    """Add a work item at most once per idempotency key, in a single round trip."""
+    async with uow:
+        created_item, created = await uow.work_items.create_idempotent(
+            workqueue.id, item.model_dump()
+        )
+        return WorkItemEnqueueResult(
+            created=created,
+            item=WorkItemRead.model_validate(created_item, from_attributes=True),
+        )
+
+
+@router.post("/{workqueue_id}/add_many")
+async def adds_workitems(
+    items: list[WorkItemCreate] = Body(min_length=1, max_length=MAX_BATCH_SIZE),
+    workqueue: Workqueue = Depends(get_workqueue),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> list[int]:
+    """Enqueue many work items in one transaction. Returns the new ids in input order."""
+    async with uow:
+        return await uow.work_items.create_many(
+            workqueue.id, [item.model_dump() for item in items]
+        )
+
+
+@router.post("/{workqueue_id}/import")
+async def imports_workitems(
+    request: Request,
+    workqueue: Workqueue = Depends(get_workqueue),
+    format: enums.WorkItemFileFormat = Query(enums.WorkItemFileFormat.NDJSON),
+    service: WorkqueueService = Depends(get_workqueue_service),
+    token: AccessToken = Depends(resolve_access_token),
+) -> WorkItemImportResult:
+    """Enqueue work items from an NDJSON or CSV request body of any size.
+
+    The body is read as it arrives and committed in batches, so a failure part
+    way keeps the batches before it. Invalid lines are skipped and reported.
+    """
+    try:
+        return await service.import_workitems(workqueue.id, request.stream(), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{workqueue_id}/next_item")
 async def gets_next_workitem(
+    wait: float = Query(
+        0,
+        ge=0,
+        le=MAX_WAIT_SECONDS,
+        description="Seconds to wait for an item to be enqueued if the queue is empty",
+    ),
     workqueue: Workqueue = Depends(get_workqueue),
     uow: AbstractUnitOfWork = Depends(get_unit_of_work),
     token: AccessToken = Depends(resolve_access_token),
@@ -196,23 +270,108 @@ async def gets_next_workitem(
     if not workqueue.enabled:
         return Response(status_code=204)
 
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+
+    async with uow:
+        while True:
+            with workqueue_notifier.subscribe(workqueue.id) as enqueued:
+                item = await uow.work_items.get_next_item(
+                    workqueue.id, workqueue.lease_seconds
+                )
+                if item is not None:
+                    return item
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return Response(status_code=204)
+
+                try:
+                    await asyncio.wait_for(enqueued.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return Response(status_code=204)
+
+
+@router.get("/{workqueue_id}/next_items")
+async def gets_next_workitems(
+    count: int = Query(10, ge=1, le=MAX_LEASE_COUNT, description="Items to claim"),
+    workqueue: Workqueue = Depends(get_workqueue),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> list[WorkItem]:
+    """Claim up to `count` items in one round trip. Returns an empty list when idle."""
+    if not workqueue.enabled:
+        return []
+
     async with uow:
-        item = await uow.work_items.get_next_item(workqueue.id)
-        return item if item is not None else Response(status_code=204)
+        return await uow.work_items.get_next_items(
+            workqueue.id, count, workqueue.lease_seconds
+        )
 
 
 @router.get("/{workqueue_id}/items")
 async def get_work_items(
     workqueue: Workqueue = Depends(get_workqueue),
     paginated_search: PaginatedSearchParams = Depends(get_paginated_search_params),
+    after: str | None = Query(
+        None,
+        description="Cursor from a previous page's next_cursor; replaces page",
+    ),
+    fulltext: str | None = Query(
+        None,
+        description="Words to match in the reference or data values (indexed)",
+    ),
+    data_contains: str | None = Query(
+        None,
+        description='JSON object the item data must contain, e.g. {"case": "123"}',
+    ),
     service: WorkqueueService = Depends(get_workqueue_service),
     token: AccessToken = Depends(resolve_access_token),
 ) -> PaginatedResponse[WorkItem]:
-    return await service.search_workitems(
-        workqueue.id,
-        paginated_search.pagination.page,
-        paginated_search.pagination.size,
-        paginated_search.search,
+    try:
+        return await service.search_workitems(
+            workqueue.id,
+            paginated_search.pagination.page,
+            paginated_search.pagination.size,
+            paginated_search.search,
+            after,
+            paginated_search.total,
+            fulltext,
+            data_contains,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workqueue_id}/export")
+async def export_work_items(
+    workqueue: Workqueue = Depends(get_workqueue),
+    format: enums.WorkItemFileFormat = Query(enums.WorkItemFileFormat.NDJSON),
+    status: enums.WorkItemStatus | None = Query(
+        None, description="Optional status filter"
+    ),
+    created_after: datetime | None = Query(
+        None, description="Only items created at or after this time"
+    ),
+    created_before: datetime | None = Query(
+        None, description="Only items created before this time"
+    ),
+    service: WorkqueueService = Depends(get_workqueue_service),
+    token: AccessToken = Depends(resolve_access_token),
+) -> StreamingResponse:
+    """Stream every matching item of the queue, newest first."""
+    media_types = {
+        enums.WorkItemFileFormat.NDJSON: "application/x-ndjson",
+        enums.WorkItemFileFormat.CSV: "text/csv",
+    }
+    filename = f"workqueue-{workqueue.id}.{format.value}"
+
+    return StreamingResponse(
+        service.export_workitems(
+            workqueue.id, format, status, created_after, created_before
+        ),
+        media_type=media_types[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -228,3 +387,18 @@ async def get_workitems_by_reference_in_workqueue(
 ) -> list[WorkItem]:
     async with uow:
         return await uow.workqueues.get_by_reference(workqueue.id, reference, status)
+
+
+@router.post("/{workqueue_id}/by_references")
+async def get_workitems_by_references_in_workqueue(
+    references: list[str] = Body(min_length=1, max_length=MAX_REFERENCE_LOOKUP),
+    workqueue: Workqueue = Depends(get_workqueue),
+    status: enums.WorkItemStatus | None = Query(
+        None, description="Optional status filter"
+    ),
+    uow: AbstractUnitOfWork = Depends(get_unit_of_work),
+    token: AccessToken = Depends(resolve_access_token),
+) -> dict[str, list[WorkItem]]:
+    """Look up many references at once; each maps to its items, newest first."""
+    async with uow:
+        return await uow.workqueues.get_by_references(workqueue.id, references, status)
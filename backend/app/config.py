@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.enums import DispatchMode
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -10,11 +12,32 @@ class Settings(BaseSettings):
     password_salt: str = "set me in the env file"
     test_database_url: str = "postgresql://localhost:5432/ats_test"
 
+    # Seconds a validated access token is trusted before it is looked up again
+    access_token_cache_ttl: int = 60
+
+    # Seconds an estimated (total=estimated) paginated count is reused
+    paginated_count_cache_ttl: int = 30
+
+    # Monthly range partitioning of auditlog by created_at. Convert the table
+    # with `python -m app.database.partitioning auditlog`; the scheduler logs
+    # an error while this setting and the table layout disagree.
+    auditlog_partitioning: bool = False
+    auditlog_retention_months: int | None = None  # drop older partitions
+    partition_premake_months: int = 3  # partitions kept ready ahead of time
+
     # Scheduler configuration
     scheduler_enabled: bool = True
     scheduler_interval: int = 10  # seconds between scheduler runs
     scheduler_error_backoff: int = 30  # seconds to wait after scheduler errors
     scheduler_max_parameter_length: int = 1000  # maximum parameter length
+    auto_clean_batch_size: int = 5000  # workitems deleted per transaction
+    auto_clean_time_budget: float = 5.0  # seconds of auto-clean per scheduler run
+    retry_backoff_max_seconds: int = 86400  # cap on a failed item's retry delay
+
+    # greedy hands each session, oldest first, the best free resource for it;
+    # matching assigns as many sessions as possible per tick, still preferring
+    # older ones, so generic sessions don't take the only specialised resource
+    dispatch_mode: DispatchMode = DispatchMode.GREEDY
 
 
 settings = Settings()
@@ -0,0 +1,44 @@
+import time
+from typing import Hashable
+
+from app.config import settings
+
+
+class CountCache:
+    """In-process cache of `count(*)` results for paginated listings.
+
+    Lets list endpoints report an approximate total without scanning the
+    filtered rows on every page request. Entries are keyed by the count query
+    and its parameters and reused for `ttl_seconds`; the oldest entries are
+    evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._counts: dict[Hashable, tuple[int, float]] = {}
+
+    def get(self, key: Hashable) -> int | None:
+        entry = self._counts.get(key)
+        if entry is None:
+            return None
+
+        count, cached_until = entry
+        if cached_until <= time.monotonic():
+            self._counts.pop(key, None)
+            return None
+
+        return count
+
+    def put(self, key: Hashable, count: int) -> None:
+        self._counts.pop(key, None)
+        while len(self._counts) >= self.max_entries:
+            self._counts.pop(next(iter(self._counts)))
+
+        self._counts[key] = (count, time.monotonic() + self.ttl_seconds)
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+count_cache = CountCache(settings.paginated_count_cache_ttl)
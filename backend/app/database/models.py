@@ -3,7 +3,8 @@ from datetime import datetime
 
 from cronsim import CronSim, CronSimError
 from pydantic import field_validator, model_validator
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Computed, SmallInteger, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 from typing_extensions import Self
 
@@ -36,6 +37,11 @@ class WorkItem(Base, table=True):
     workqueue_id: int = Field(foreign_key="workqueue.id")
     started_at: datetime | None = Field(default=None)
     work_duration_seconds: int | None = Field(default=None)
+    lease_until: datetime | None = Field(default=None)
+    idempotency_key: str | None = Field(default=None)
+    priority: int = Field(default=0)
+    not_before: datetime | None = Field(default=None)
+    attempts: int = Field(default=0)
     created_at: datetime = Field(default_factory=lambda: datetime.now())
     updated_at: datetime = Field(default_factory=lambda: datetime.now())
 
@@ -46,6 +52,11 @@ class Workqueue(Base, table=True):
     description: typing.Optional[str]
     enabled: bool = Field(default=True)
     auto_clean_max_age_days: int | None = Field(default=None)
+    lease_seconds: int | None = Field(default=None)
+    max_attempts: int | None = Field(default=None)
+    retry_backoff_seconds: int = Field(default=60)
+    # When max_attempts was last enabled; earlier failures are never retried
+    retry_policy_since: datetime | None = Field(default=None)
 
     deleted: bool = False
 
@@ -53,6 +64,21 @@ class Workqueue(Base, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now())
 
 
+class WorkqueueItemCount(Base, table=True):
+    """Per-queue, per-status item count, maintained by triggers on workitem.
+
+    Each count is spread over several slot rows so concurrent writers on one
+    queue rarely wait for the same row lock; the count is the sum of its slots.
+    """
+
+    workqueue_id: int = Field(
+        foreign_key="workqueue.id", primary_key=True, ondelete="CASCADE"
+    )
+    status: enums.WorkItemStatus = Field(primary_key=True)
+    slot: int = Field(default=0, primary_key=True, sa_type=SmallInteger)
+    count: int = Field(sa_type=BigInteger)
+
+
 class Process(Base, table=True):
     id: int | None = Field(default=None, primary_key=True)
     name: str
@@ -157,6 +183,18 @@ class Resource(Base, table=True):
     name: str
     fqdn: str
     capabilities: str
+    # Generated by the database from capabilities and GIN indexed, so resources
+    # able to run a process are found with a single @> query
+    capability_set: typing.Optional[typing.List[str]] = Field(
+        default=None,
+        sa_column=Column(
+            ARRAY(Text),
+            Computed(
+                "array_remove(regexp_split_to_array(btrim(capabilities), '[ ,]+'), '')",
+                persisted=True,
+            ),
+        ),
+    )
 
     available: bool = Field()
 
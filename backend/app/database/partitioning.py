@@ -0,0 +1,280 @@
+"""Monthly range partitions on created_at for append-mostly tables.
+
+A table is converted explicitly, once, with
+
+    python -m app.database.partitioning auditlog
+
+after enabling it in settings. Afterwards `maintain_partitions` keeps
+partitions for the coming months in place and drops whole partitions once they
+are past retention, which is O(1) compared to deleting their rows. Everything
+here is a no-op for tables that are not partitioned.
+"""
+
+import argparse
+import logging
+import re
+from datetime import date, datetime
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.session import sync_engine
+
+logger = logging.getLogger(__name__)
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+_IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+    "WHERE partrelid = to_regclass(:table))"
+)
+
+# Tables that can be partitioned, with whether settings ask for it
+PARTITIONED_TABLES = {"auditlog": lambda: settings.auditlog_partitioning}
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: date) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def create_partition_sql(table: str, start: date) -> str:
+    return (
+        f"CREATE TABLE {partition_name(table, start)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start}') TO ('{add_months(start, 1)}')"
+    )
+
+
+async def is_partitioned(session: AsyncSession, table: str) -> bool:
+    result = await session.execute(_IS_PARTITIONED, {"table": table})
+    return result.scalar_one()
+
+
+async def get_partitions(
+    session: AsyncSession, table: str
+) -> list[tuple[str, date | None]]:
+    """Return (name, exclusive upper bound) per partition; None for DEFAULT/MAXVALUE."""
+    result = await session.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table) "
+            "ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for name, bound in result.all():
+        match = _UPPER_BOUND.search(bound)
+        upper = datetime.fromisoformat(match.group(1)).date() if match else None
+        partitions.append((name, upper))
+    return partitions
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    table: str,
+    months_ahead: int,
+    today: date | None = None,
+) -> list[str]:
+    """Create the monthly partitions from now through `months_ahead` months out."""
+    if not await is_partitioned(session, table):
+        return []
+
+    today = today or date.today()
+    uppers = [upper for _, upper in await get_partitions(session, table) if upper]
+    start = max([month_start(today), *uppers])
+    end = add_months(month_start(today), months_ahead + 1)
+
+    created = []
+    while start < end:
+        try:
+            await session.execute(text(create_partition_sql(table, start)))
+            await session.commit()
+        except DBAPIError as e:
+            # Typically rows for this month already landed in the default
+            # partition; leave them there rather than failing every run
+            await session.rollback()
+            logger.warning(
+                f"Could not create partition {partition_name(table, start)}: {e}"
+            )
+            break
+        created.append(partition_name(table, start))
+        start = add_months(start, 1)
+
+    return created
+
+
+async def drop_expired_partitions(
+    session: AsyncSession,
+    table: str,
+    retention_months: int,
+    today: date | None = None,
+) -> list[str]:
+    """Drop partitions whose rows are all older than `retention_months` months."""
+    if not await is_partitioned(session, table):
+        return []
+
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    dropped = []
+    for name, upper in await get_partitions(session, table):
+        if upper is not None and upper <= cutoff:
+            await session.execute(text(f"DROP TABLE {name}"))
+            await session.commit()
+            dropped.append(name)
+
+    return dropped
+
+
+async def maintain_partitions(session: AsyncSession) -> None:
+    """Pre-create upcoming partitions and drop expired ones for partitioned tables."""
+    retention = {"auditlog": settings.auditlog_retention_months}
+
+    for table, retention_months in retention.items():
+        partitioned = await is_partitioned(session, table)
+        if PARTITIONED_TABLES[table]() and not partitioned:
+            logger.error(
+                f"{table} partitioning is enabled but the table is not "
+                f"partitioned; convert it with "
+                f"`python -m app.database.partitioning {table}`"
+            )
+        elif partitioned and not PARTITIONED_TABLES[table]():
+            logger.error(
+                f"{table} is partitioned but partitioning is disabled in settings"
+            )
+
+        created = await ensure_partitions(
+            session, table, settings.partition_premake_months
+        )
+        if created:
+            logger.info(f"Created partitions {', '.join(created)}")
+
+        if retention_months is not None:
+            dropped = await drop_expired_partitions(session, table, retention_months)
+            if dropped:
+                logger.info(f"Dropped expired partitions {', '.join(dropped)}")
+
+
+def _table_definition(connection: Connection, table: str, skip: list[str]):
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}
+    ).scalar_one()
+    indexes = connection.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND NOT indexname = ANY(:skip)"
+        ),
+        {"table": table, "skip": skip},
+    ).all()
+    foreign_keys = connection.execute(
+        text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+    return sequence, indexes, foreign_keys
+
+
+def partition_table(
+    engine: Engine, table: str, months_ahead: int, today: date | None = None
+) -> bool:
+    """Convert `table` to monthly range partitions on created_at.
+
+    The existing table is attached as the first partition (`<table>_legacy`)
+    instead of being copied: the unique index and range check it needs are
+    built beforehand without blocking writers, so the swap itself only touches
+    the catalog. Partitions for the next `months_ahead` months and a DEFAULT
+    partition are created with it. The `partition_auditlog` migration reverts
+    the conversion on downgrade.
+
+    Returns:
+        False if the table was partitioned already
+    """
+    with engine.connect() as connection:
+        if connection.execute(_IS_PARTITIONED, {"table": table}).scalar_one():
+            return False
+
+    # Everything before `bound` stays in the legacy partition
+    bound = add_months(month_start(today or date.today()), 2)
+    legacy = f"{table}_legacy"
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(
+            text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+                f"{legacy}_id_created_at_key ON {table} (id, created_at)"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {legacy}_bound "
+                f"CHECK (created_at < '{bound}') NOT VALID"
+            )
+        )
+        conn.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {legacy}_bound"))
+
+    with engine.begin() as conn:
+        sequence, indexes, foreign_keys = _table_definition(
+            conn, table, [f"{table}_pkey", f"{legacy}_id_created_at_key"]
+        )
+
+        statements = [
+            f"ALTER TABLE {table} RENAME TO {legacy}",
+            f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey",
+            # Attaching matches the parent's primary key to a unique constraint
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_id_created_at_key "
+            f"UNIQUE USING INDEX {legacy}_id_created_at_key",
+            *(f"ALTER INDEX {name} RENAME TO {name}_legacy" for name, _ in indexes),
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)",
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+            f"PRIMARY KEY (id, created_at)",
+            # The definitions still name the original table, now partitioned
+            *(definition for _, definition in indexes),
+            *(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+                for name, definition in foreign_keys
+            ),
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{bound}')",
+            f"ALTER TABLE {legacy} DROP CONSTRAINT {legacy}_bound",
+            f"ALTER SEQUENCE {sequence} OWNED BY {table}.id",
+            *(
+                create_partition_sql(table, add_months(bound, months))
+                for months in range(months_ahead)
+            ),
+            f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT",
+        ]
+        for statement in statements:
+            conn.execute(text(statement))
+
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a table to monthly partitions on created_at."
+    )
+    parser.add_argument("table", choices=sorted(PARTITIONED_TABLES))
+    args = parser.parse_args()
+
+    if partition_table(sync_engine, args.table, settings.partition_premake_months):
+        print(f"Partitioned {args.table}")
+    else:
+        print(f"{args.table} is partitioned already")
+
+
+if __name__ == "__main__":
+    main()
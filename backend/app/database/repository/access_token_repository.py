@@ -20,6 +20,19 @@ class AccessTokenRepository(DatabaseRepository[AccessToken]):
             )
         ).first()
 
+    async def get_by_token(self, token: str) -> AccessToken | None:
+        return (
+            await self.session.scalars(
+                select(AccessToken).where(AccessToken.access_token == token)
+            )
+        ).first()
+
+    async def has_active_tokens(self) -> bool:
+        result = await self.session.execute(
+            select(AccessToken.id).where(AccessToken.deleted == False).limit(1)  # noqa: E712
+        )
+        return result.first() is not None
+
     async def create(self, identifier: str) -> AccessToken:
         # Generate a random 128 character string for the token
         token = secrets.token_urlsafe(128)
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from sqlmodel import select
 
+import app.enums as enums
 from app.database.models import AuditLog
 
 from .database_repository import AbstractRepository, DatabaseRepository
@@ -17,7 +18,8 @@ class AbstractAuditLogRepository(AbstractRepository[AuditLog]):
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[AuditLog], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[AuditLog], int | None]:
         raise NotImplementedError
 
     async def get_logs_by_session_id(
@@ -54,7 +56,8 @@ class AuditLogRepository(AbstractAuditLogRepository, DatabaseRepository[AuditLog
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[AuditLog], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[AuditLog], int | None]:
         query = select(AuditLog).where(AuditLog.session_id == session_id)
 
         if search:
@@ -64,7 +67,7 @@ class AuditLogRepository(AbstractAuditLogRepository, DatabaseRepository[AuditLog
         if query.whereclause is not None:
             count_query = count_query.where(query.whereclause)
 
-        total_count = (await self.session.execute(count_query)).scalar_one()
+        total_count = await self.count_total(count_query, total)
 
         items = (await self.session.scalars(query.offset(skip).limit(limit))).all()
 
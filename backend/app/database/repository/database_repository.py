@@ -1,11 +1,14 @@
+import json
 from datetime import datetime
 from typing import Generic, TypeVar
 
-from sqlalchemy import BinaryExpression
+from sqlalchemy import BinaryExpression, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.database.count_cache import count_cache
 from app.database.models import Base
+from app.enums import TotalCount
 
 Model = TypeVar("Model", bound=Base)
 
@@ -90,3 +93,31 @@ class DatabaseRepository(AbstractRepository[Model]):
         if expressions:
             query = query.where(*expressions)
         return list(await self.session.scalars(query))
+
+    async def count_total(
+        self, count_query: Select, total: TotalCount = TotalCount.EXACT
+    ) -> int | None:
+        """Run a paginated listing's count query according to `total`.
+
+        EXACT always counts, ESTIMATED reuses a recent count of the same query
+        from the count cache, and NONE skips counting and returns None.
+        """
+        if total == TotalCount.NONE:
+            return None
+
+        key = None
+        if total == TotalCount.ESTIMATED:
+            compiled = count_query.compile()
+            # Params can be unhashable (a dict for a JSONB containment filter)
+            params = json.dumps(compiled.params, sort_keys=True, default=str)
+            key = (str(compiled), params)
+            cached = count_cache.get(key)
+            if cached is not None:
+                return cached
+
+        count = (await self.session.execute(count_query)).scalar_one()
+
+        if key is not None:
+            count_cache.put(key, count)
+
+        return count
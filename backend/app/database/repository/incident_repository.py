@@ -30,7 +30,8 @@ class AbstractIncidentRepository(AbstractRepository[Incident]):
         status: Optional[enums.IncidentStatus] = None,
         skip: int = 0,
         limit: int = 10,
-    ) -> tuple[List[Incident], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[Incident], int | None]:
         raise NotImplementedError
 
 
@@ -82,7 +83,8 @@ class IncidentRepository(AbstractIncidentRepository, DatabaseRepository[Incident
         status: Optional[enums.IncidentStatus] = None,
         skip: int = 0,
         limit: int = 10,
-    ) -> tuple[List[Incident], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[Incident], int | None]:
         query = select(Incident).where(Incident.deleted == False)  # noqa: E712
 
         if status is not None:
@@ -113,7 +115,7 @@ class IncidentRepository(AbstractIncidentRepository, DatabaseRepository[Incident
                 .filter(Process.name.ilike(f"%{search}%"))
             )
 
-        total_count = (await self.session.execute(count_query)).scalar_one()
+        total_count = await self.count_total(count_query, total)
 
         items = (await self.session.scalars(query.offset(skip).limit(limit))).all()
 
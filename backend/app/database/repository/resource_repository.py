@@ -1,7 +1,9 @@
 import abc
+from typing import Iterable
 
+from sqlalchemy import exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import or_, select
+from sqlmodel import select
 
 from app.database.models import Resource, Session
 from app.enums import SessionStatus
@@ -15,7 +17,13 @@ class AbstractResourceRepository(AbstractRepository[Resource]):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def get_available_resources(self) -> list[Resource]:
+    async def get_available_resources(
+        self, requirements: Iterable[str] = ()
+    ) -> list[Resource]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def has_available_resource(self, requirements: Iterable[str] = ()) -> bool:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -32,32 +40,47 @@ class ResourceRepository(AbstractResourceRepository, DatabaseRepository[Resource
             await self.session.scalars(select(Resource).where(Resource.fqdn == fqdn))
         ).first()
 
-    async def get_available_resources(self) -> list[Resource]:
-        resources = (
-            await self.session.scalars(
-                select(Resource).where(Resource.deleted == False)  # noqa: E712
-            )
-        ).all()
+    @staticmethod
+    def _has_active_session():
+        # Served by the partial index ix_session_active_resource_id
+        return exists().where(
+            Session.resource_id == Resource.id,
+            Session.status.in_([SessionStatus.NEW, SessionStatus.IN_PROGRESS]),
+        )
 
-        result = []
-        for resource in resources:
-            if await self.is_resource_available(resource):
-                result.append(resource)
-        return result
+    @classmethod
+    def _is_available(cls, requirements: Iterable[str]):
+        conditions = [
+            Resource.deleted == False,  # noqa: E712
+            ~cls._has_active_session(),
+        ]
+        required = sorted(name for name in requirements if name)
+        if required:
+            # Served by the GIN index ix_resource_capability_set
+            conditions.append(Resource.capability_set.contains(required))
+        return conditions
 
-    async def is_resource_available(self, resource: Resource) -> bool:
+    async def get_available_resources(
+        self, requirements: Iterable[str] = ()
+    ) -> list[Resource]:
+        """Resources without a NEW or IN_PROGRESS session, in one anti-join query.
 
-        sessions = (
+        With `requirements`, only resources having all of those capabilities.
+        """
+        return list(
             await self.session.scalars(
-                select(Session)
-                .where(Session.resource_id == resource.id)
-                .where(
-                    or_(
-                        Session.status == SessionStatus.NEW,
-                        Session.status == SessionStatus.IN_PROGRESS,
-                    )
-                )
+                select(Resource)
+                .where(*self._is_available(requirements))
+                .order_by(Resource.id)
             )
-        ).all()
+        )
 
-        return len(sessions) == 0
+    async def has_available_resource(self, requirements: Iterable[str] = ()) -> bool:
+        return await self.session.scalar(
+            select(exists().where(*self._is_available(requirements)))
+        )
+
+    async def is_resource_available(self, resource: Resource) -> bool:
+        return not await self.session.scalar(
+            select(self._has_active_session()).where(Resource.id == resource.id)
+        )
@@ -1,14 +1,16 @@
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+from sqlalchemy import column, update, values
 from sqlalchemy.ext.asyncio import AsyncSession as SqlAsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import case, func
-from sqlalchemy.types import String
+from sqlalchemy.types import Integer, String
 from sqlmodel import cast, or_, select
 
 import app.enums as enums
-from app.database.models import AuditLog, Incident, Process, Session
+from app.database.models import AuditLog, Incident, Process, Resource, Session
 
 from .database_repository import AbstractRepository, DatabaseRepository
 
@@ -20,6 +22,11 @@ class AbstractSessionRepository(AbstractRepository[Session]):
     async def get_new_sessions(self) -> list[Session]:
         raise NotImplementedError
 
+    async def assign_resources(
+        self, assignments: list[tuple[Session, Resource]]
+    ) -> list[tuple[Session, Resource]]:
+        raise NotImplementedError
+
     async def get_active_sessions(self) -> list[Session]:
         raise NotImplementedError
 
@@ -35,7 +42,8 @@ class AbstractSessionRepository(AbstractRepository[Session]):
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[Session], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[Session], int | None]:
         raise NotImplementedError
 
     async def get_process_activity_summary(self, since: datetime) -> list[dict]:
@@ -89,6 +97,57 @@ class SessionRepository(AbstractSessionRepository, DatabaseRepository[Session]):
             ).all()
         )
 
+    async def assign_resources(
+        self, assignments: list[tuple[Session, Resource]]
+    ) -> list[tuple[Session, Resource]]:
+        """
+        Dispatches sessions to resources and marks the resources unavailable, in one statement.
+
+        Sessions that are no longer NEW and undispatched are skipped, together with their
+        resource. The given objects are updated in place without being marked dirty.
+
+        Returns:
+            list[tuple[models.Session, models.Resource]]: The assignments that were applied.
+        """
+        if not assignments:
+            return []
+
+        now = datetime.now()
+        pairs = values(
+            column("session_id", Integer),
+            column("resource_id", Integer),
+            name="assignment",
+        ).data([(session.id, resource.id) for session, resource in assignments])
+        dispatched = (
+            update(Session)
+            .where(Session.id == pairs.c.session_id)
+            .where(Session.status == enums.SessionStatus.NEW)
+            .where(Session.resource_id == None)  # noqa: E711
+            .values(resource_id=pairs.c.resource_id, dispatched_at=now, updated_at=now)
+            .returning(Session.resource_id)
+            .cte("dispatched")
+        )
+        result = await self.session.scalars(
+            update(Resource)
+            .where(Resource.id.in_(select(dispatched.c.resource_id)))
+            .values(available=False, updated_at=now)
+            .returning(Resource.id)
+            .execution_options(synchronize_session=False)
+        )
+        applied_resource_ids = set(result.all())
+        await self.session.commit()
+
+        applied = [
+            (session, resource)
+            for session, resource in assignments
+            if resource.id in applied_resource_ids
+        ]
+        for session, resource in applied:
+            set_committed_value(session, "resource_id", resource.id)
+            set_committed_value(session, "dispatched_at", now)
+            set_committed_value(resource, "available", False)
+        return applied
+
     async def get_active_sessions(self) -> list[Session]:
         """
         Fetches all active sessions.
@@ -203,7 +262,8 @@ class SessionRepository(AbstractSessionRepository, DatabaseRepository[Session]):
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[Session], int]:
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+    ) -> tuple[List[Session], int | None]:
         query = select(Session)
 
         if not include_deleted:
@@ -227,7 +287,7 @@ class SessionRepository(AbstractSessionRepository, DatabaseRepository[Session]):
 
             count_query = count_query.where(query.whereclause)
 
-        total_count = (await self.session.execute(count_query)).scalar_one()
+        total_count = await self.count_total(count_query, total)
 
         items = (await self.session.scalars(query.offset(skip).limit(limit))).all()
 
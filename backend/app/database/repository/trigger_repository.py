@@ -1,14 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
 
-from app.database.models import Trigger
+from app.database.models import Process, Trigger
 
 from .database_repository import AbstractRepository, DatabaseRepository
 
 
 class AbstractTriggerRepository(AbstractRepository[Trigger]):
-    pass
+    async def get_enabled_with_process(self) -> list[Trigger]:
+        raise NotImplementedError
 
 
 class TriggerRepository(AbstractTriggerRepository, DatabaseRepository[Trigger]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(Trigger, session)
+
+    async def get_enabled_with_process(self) -> list[Trigger]:
+        """
+        Fetches the enabled triggers of non-deleted processes, with the process loaded.
+
+        Returns:
+            list[models.Trigger]: Enabled, non-deleted triggers ordered by id.
+        """
+        return list(
+            await self.session.scalars(
+                select(Trigger)
+                .join(Trigger.process)
+                .options(contains_eager(Trigger.process))
+                .where(Trigger.deleted == False)  # noqa: E712
+                .where(Trigger.enabled == True)  # noqa: E712
+                .where(Process.deleted == False)  # noqa: E712
+                .order_by(Trigger.id)
+            )
+        )
@@ -1,19 +1,53 @@
 import abc
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    column,
+    func,
+    insert,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import desc, select
 
 import app.enums as enums
 from app.database.models import WorkItem
+from app.database.workqueue_notifier import workqueue_notifier
 
 from .database_repository import AbstractRepository, DatabaseRepository
 
 
 class AbstractWorkItemRepository(AbstractRepository[WorkItem]):
     @abc.abstractmethod
-    async def get_next_item(self, queue_id: int):
+    async def get_next_item(self, queue_id: int, lease_seconds: int | None = None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_next_items(
+        self, queue_id: int, count: int, lease_seconds: int | None = None
+    ) -> list[WorkItem]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def extend_lease(self, item: WorkItem, lease_seconds: int) -> WorkItem:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_statuses(self, changes: list[dict]) -> list[WorkItem]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def requeue(
+        self, item: WorkItem, delay_seconds: int = 0, message: str | None = None
+    ) -> WorkItem:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -22,60 +56,251 @@ class AbstractWorkItemRepository(AbstractRepository[WorkItem]):
     ) -> list[WorkItem]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def create_many(self, queue_id: int, items: list[dict]) -> list[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create_idempotent(
+        self, queue_id: int, item: dict
+    ) -> tuple[WorkItem, bool]:
+        raise NotImplementedError
+
 
 class WorkItemRepository(DatabaseRepository[WorkItem]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(WorkItem, session)
 
-    async def get_next_item(self, queue_id: int):
+    async def create(self, data: dict) -> WorkItem:
+        instance = WorkItem(**data)
+        self.session.add(instance)
+        await workqueue_notifier.publish(self.session, instance.workqueue_id)
+        await self.session.commit()
+        await self.session.refresh(instance)
+        workqueue_notifier.notify(instance.workqueue_id)
+        return instance
+
+    async def update(self, instance: WorkItem, data: dict) -> WorkItem:
+        # An item set back to NEW is enqueued again; wake up waiting dequeuers
+        requeued = data.get("status") == enums.WorkItemStatus.NEW
+        if requeued:
+            await workqueue_notifier.publish(self.session, instance.workqueue_id)
+        instance = await super().update(instance, data)
+        if requeued:
+            workqueue_notifier.notify(instance.workqueue_id)
+        return instance
+
+    async def get_next_item(self, queue_id: int, lease_seconds: int | None = None):
         """
         Retrieves and locks the next available work item from a specified queue.
 
-        This method selects the next available work item based on the provided
-        queue ID, marking the item as locked and updating its status to
-        IN_PROGRESS. It ensures atomicity through transaction management and
-        prioritizes items based on their creation timestamp.
-
         Parameters:
             queue_id (int): The ID of the queue to retrieve the next work item from.
+            lease_seconds (int | None): Lease length for the claimed item, if any.
 
         Returns:
             WorkItem | None: The next available work item if found; otherwise, None.
+        """
+        items = await self.get_next_items(queue_id, 1, lease_seconds)
+        return items[0] if items else None
+
+    async def get_next_items(
+        self, queue_id: int, count: int, lease_seconds: int | None = None
+    ) -> list[WorkItem]:
+        """
+        Retrieves and locks up to `count` available work items from a specified queue.
+
+        The items are claimed in a single statement: a `SELECT ... FOR UPDATE SKIP
+        LOCKED` picks the NEW items with the highest priority, oldest first within
+        a priority, and the surrounding UPDATE marks them locked and IN_PROGRESS.
+        Concurrent callers never receive the same item. Items whose `not_before`
+        lies in the future are skipped; due ones compete on priority and age and
+        have `not_before` cleared when claimed.
+
+        Parameters:
+            queue_id (int): The ID of the queue to retrieve work items from.
+            count (int): The maximum number of items to claim.
+            lease_seconds (int | None): If set, the claimed items are leased until
+                now + lease_seconds and requeued by the scheduler when it expires.
+
+        Returns:
+            list[WorkItem]: The claimed items in dequeue order. Empty if the queue is
+                empty.
 
         Raises:
             Exception: Propagates any exceptions that occur during database access or
                     transaction handling, after rolling back any changes.
         """
+        now = datetime.now()
+
+        def candidates(name: str, *conditions):
+            # Use skip_locked to avoid waiting for locked rows
+            return (
+                select(WorkItem.id, WorkItem.priority, WorkItem.created_at)
+                .where(WorkItem.workqueue_id == queue_id)
+                .where(WorkItem.locked == False)  # noqa: E712
+                .where(WorkItem.status == enums.WorkItemStatus.NEW)
+                .where(*conditions)
+                .order_by(WorkItem.priority.desc(), WorkItem.created_at)
+                .limit(count)
+                .with_for_update(skip_locked=True)
+                .cte(name)
+            )
+
+        # Ready items come from ix_workitem_dequeue_ready. Delayed items that
+        # are due but not yet released by the scheduler come from
+        # ix_workitem_not_before; only the claimed ones are released.
+        ready = candidates("ready", WorkItem.not_before == None)  # noqa: E711
+        due = candidates("due", WorkItem.not_before <= now)
+        pool = union_all(select(ready), select(due)).subquery("pool")
+        next_ids = (
+            select(pool.c.id)
+            .order_by(pool.c.priority.desc(), pool.c.created_at)
+            .limit(count)
+            .cte("next_ids")
+        )
+
+        try:
+            items = await self.session.scalars(
+                update(WorkItem)
+                .where(WorkItem.id.in_(select(next_ids.c.id)))
+                .values(
+                    locked=True,
+                    status=enums.WorkItemStatus.IN_PROGRESS,
+                    not_before=None,
+                    attempts=WorkItem.attempts + 1,
+                    started_at=now,
+                    updated_at=now,
+                    lease_until=self._lease_until(now, lease_seconds),
+                )
+                .returning(WorkItem)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            claimed = sorted(
+                items.all(),
+                key=lambda item: (-item.priority, item.created_at, item.id),
+            )
+            await self.session.commit()
+            return claimed
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+
+    async def extend_lease(self, item: WorkItem, lease_seconds: int) -> WorkItem:
+        """Push the item's lease expiry to now + lease_seconds."""
+        return await self.update(
+            item, {"lease_until": self._lease_until(datetime.now(), lease_seconds)}
+        )
+
+    async def update_statuses(self, changes: list[dict]) -> list[WorkItem]:
+        """Apply many id/status/message changes in one UPDATE ... FROM VALUES.
+
+        Follows the single-item status endpoint: IN_PROGRESS sets started_at,
+        COMPLETED and FAILED record work_duration_seconds since started_at, and
+        every status other than IN_PROGRESS releases the lock and lease. A
+        missing message keeps the current one. Nothing is changed unless all
+        items exist.
+
+        Raises:
+            ValueError: If any of the ids is not a workitem.
+        """
+        status_type = WorkItem.__table__.c.status.type
+        rows = values(
+            column("id", Integer),
+            column("status", status_type),
+            column("message", String),
+            name="changes",
+        ).data(
+            [
+                (change["id"], change["status"], change.get("message"))
+                for change in changes
+            ]
+        )
+        status = cast(rows.c.status, status_type)
+
+        now = datetime.now()
+        stopped = status != enums.WorkItemStatus.IN_PROGRESS
+        finished = status.in_(
+            [enums.WorkItemStatus.COMPLETED, enums.WorkItemStatus.FAILED]
+        )
+        # Truncated like int() on the single-item endpoint, not rounded
+        duration = cast(
+            func.trunc(func.extract("epoch", now - WorkItem.started_at)), Integer
+        )
+
         try:
-            item = (
-                await self.session.scalars(
-                    select(WorkItem)
-                    .where(WorkItem.workqueue_id == queue_id)
-                    .where(WorkItem.locked == False)  # noqa: E712
-                    .where(WorkItem.status == enums.WorkItemStatus.NEW)
-                    .order_by(WorkItem.created_at)
-                    .limit(1)
-                    .with_for_update(
-                        skip_locked=True
-                    )  # Use skip_locked to avoid waiting for locked rows
+            result = await self.session.scalars(
+                update(WorkItem)
+                .where(WorkItem.id == rows.c.id)
+                .values(
+                    status=status,
+                    message=func.coalesce(rows.c.message, WorkItem.message),
+                    started_at=case((stopped, WorkItem.started_at), else_=now),
+                    work_duration_seconds=case(
+                        (finished & (WorkItem.started_at != None), duration),  # noqa: E711
+                        else_=WorkItem.work_duration_seconds,
+                    ),
+                    locked=case((stopped, False), else_=WorkItem.locked),
+                    lease_until=case((stopped, None), else_=WorkItem.lease_until),
+                    updated_at=now,
                 )
-            ).first()
+                .returning(WorkItem)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            items = result.all()
 
-            if item is None:
-                return None
+            missing = {change["id"] for change in changes} - {item.id for item in items}
+            if missing:
+                raise ValueError(
+                    f"Workitems not found: {', '.join(map(str, sorted(missing)))}"
+                )
 
-            item.locked = True
-            item.status = enums.WorkItemStatus.IN_PROGRESS
-            item.started_at = datetime.now()
-            item.updated_at = datetime.now()
-            self.session.add(item)
+            requeued = {
+                item.workqueue_id
+                for item in items
+                if item.status == enums.WorkItemStatus.NEW
+            }
+            for queue_id in requeued:
+                await workqueue_notifier.publish(self.session, queue_id)
             await self.session.commit()
-            await self.session.refresh(item)
-            return item
-        except IntegrityError:
+        except (ValueError, IntegrityError):
             await self.session.rollback()
             raise
 
+        for queue_id in requeued:
+            workqueue_notifier.notify(queue_id)
+        return items
+
+    async def requeue(
+        self, item: WorkItem, delay_seconds: int = 0, message: str | None = None
+    ) -> WorkItem:
+        """Return the item to NEW, hidden from dequeue for `delay_seconds`."""
+        now = datetime.now()
+        data = {
+            "status": enums.WorkItemStatus.NEW,
+            "locked": False,
+            "started_at": None,
+            "lease_until": None,
+            "not_before": now + timedelta(seconds=delay_seconds)
+            if delay_seconds
+            else None,
+            "updated_at": now,
+        }
+        if message is not None:
+            data["message"] = message
+
+        for key, value in data.items():
+            setattr(item, key, value)
+        await workqueue_notifier.publish(self.session, item.workqueue_id)
+        await self.session.commit()
+        await self.session.refresh(item)
+        workqueue_notifier.notify(item.workqueue_id)
+        return item
+
+    @staticmethod
+    def _lease_until(now: datetime, lease_seconds: int | None) -> datetime | None:
+        return now + timedelta(seconds=lease_seconds) if lease_seconds else None
+
     async def get_by_reference(
         self, reference: str, status: enums.WorkItemStatus | None = None
     ) -> list[WorkItem]:
@@ -91,3 +316,89 @@ class WorkItemRepository(DatabaseRepository[WorkItem]):
         query = query.order_by(desc(WorkItem.created_at))
 
         return list(await self.session.scalars(query))
+
+    async def create_many(self, queue_id: int, items: list[dict]) -> list[int]:
+        """Insert many NEW work items in one transaction, returning ids in input order."""
+        if not items:
+            return []
+
+        now = datetime.now()
+        rows = [
+            {
+                "data": item.get("data") or {},
+                "reference": item.get("reference", ""),
+                "priority": item.get("priority", 0),
+                "not_before": item.get("not_before"),
+                "locked": False,
+                "status": enums.WorkItemStatus.NEW,
+                "message": "",
+                "workqueue_id": queue_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for item in items
+        ]
+
+        try:
+            result = await self.session.execute(
+                insert(WorkItem).returning(WorkItem.id, sort_by_parameter_order=True),
+                rows,
+            )
+            ids = list(result.scalars())
+            await workqueue_notifier.publish(self.session, queue_id)
+            await self.session.commit()
+            workqueue_notifier.notify(queue_id)
+            return ids
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+
+    async def create_idempotent(
+        self, queue_id: int, item: dict
+    ) -> tuple[WorkItem, bool]:
+        """Insert a NEW work item unless its idempotency key is already in the queue.
+
+        Returns the item and whether it was created by this call. Concurrent
+        calls with the same key are resolved by the unique index, so exactly one
+        of them creates the item and the others get it back.
+        """
+        now = datetime.now()
+        statement = (
+            pg_insert(WorkItem)
+            .values(
+                data=item.get("data") or {},
+                reference=item.get("reference", ""),
+                idempotency_key=item["idempotency_key"],
+                priority=item.get("priority", 0),
+                not_before=item.get("not_before"),
+                locked=False,
+                status=enums.WorkItemStatus.NEW,
+                message="",
+                workqueue_id=queue_id,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[WorkItem.workqueue_id, WorkItem.idempotency_key],
+                index_where=WorkItem.idempotency_key.is_not(None),
+            )
+            .returning(WorkItem)
+        )
+
+        created = (await self.session.scalars(statement)).first()
+        if created is not None:
+            await workqueue_notifier.publish(self.session, queue_id)
+            await self.session.commit()
+            workqueue_notifier.notify(queue_id)
+            return created, True
+
+        existing = (
+            await self.session.scalars(
+                select(WorkItem).where(
+                    WorkItem.workqueue_id == queue_id,
+                    WorkItem.idempotency_key == item["idempotency_key"],
+                )
+            )
+        ).one()
+        await self.session.commit()
+        return existing, False
@@ -1,19 +1,32 @@
 import abc
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from sqlalchemy import or_
+from sqlalchemy import BigInteger, DateTime, literal, literal_column, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from sqlalchemy.types import String
-from sqlmodel import cast, delete, select
+from sqlmodel import cast, delete, select, update
 
 import app.enums as enums
-from app.database.models import WorkItem, Workqueue
+from app.config import settings
+from app.database.models import WorkItem, Workqueue, WorkqueueItemCount
+from app.database.workqueue_notifier import workqueue_notifier
 
 from .database_repository import AbstractRepository, DatabaseRepository
 
+# Must match the expression of the ix_workitem_search index verbatim, or the
+# planner cannot use it. Only string and number values of `data` are indexed.
+WORKITEM_SEARCH_VECTOR = literal_column(
+    "to_tsvector('simple'::regconfig, coalesce(workitem.reference, '')) || "
+    "jsonb_to_tsvector('simple'::regconfig, workitem.data, "
+    '\'["string", "numeric"]\'::jsonb)'
+)
+
+# A counter is spread over slot rows; sum(bigint) is numeric in Postgres
+ITEM_COUNT = cast(func.sum(WorkqueueItemCount.count), BigInteger)
+
 
 class AbstractWorkqueueRepository(AbstractRepository[Workqueue]):
     @abc.abstractmethod
@@ -26,6 +39,12 @@ class AbstractWorkqueueRepository(AbstractRepository[Workqueue]):
     ) -> dict[int, dict[enums.WorkItemStatus, int]]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_pending_workitem_counts(
+        self, workqueue_ids: list[int]
+    ) -> dict[int, int]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_workitems_paginated(
         self,
@@ -34,7 +53,11 @@ class AbstractWorkqueueRepository(AbstractRepository[Workqueue]):
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[WorkItem], int]:
+        after: tuple[datetime, int] | None = None,
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+        fulltext: str | None = None,
+        data_contains: dict | None = None,
+    ) -> tuple[List[WorkItem], int | None]:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -55,6 +78,26 @@ class AbstractWorkqueueRepository(AbstractRepository[Workqueue]):
     ) -> list[WorkItem]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_by_references(
+        self,
+        workqueue_id: int,
+        references: list[str],
+        status: enums.WorkItemStatus | None = None,
+    ) -> dict[str, list[WorkItem]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stream_workitems(
+        self,
+        workqueue_id: int,
+        status: enums.WorkItemStatus | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[WorkItem]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_auto_clean_workqueues(self) -> list[Workqueue]:
         raise NotImplementedError
@@ -65,26 +108,59 @@ class AbstractWorkqueueRepository(AbstractRepository[Workqueue]):
     ) -> int:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def clear_terminal_items_batch(
+        self, workqueue_id: int, days: int, after_id: int, batch_size: int
+    ) -> tuple[int, int | None]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def requeue_expired_leases(self) -> dict[int, int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def release_delayed_items(self) -> dict[int, int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def retry_failed_items(self) -> dict[int, int]:
+        raise NotImplementedError
+
 
 class WorkqueueRepository(DatabaseRepository[Workqueue]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(Workqueue, session)
 
+    async def create(self, data: dict) -> Workqueue:
+        if data.get("max_attempts") is not None:
+            data = {**data, "retry_policy_since": datetime.now()}
+        return await super().create(data)
+
+    async def update(self, instance: Workqueue, data: dict) -> Workqueue:
+        # Enabling retries must not revive the queue's historic failures
+        if data.get("max_attempts") is not None and instance.max_attempts is None:
+            data = {**data, "retry_policy_since": datetime.now()}
+        return await super().update(instance, data)
+
     async def get_workitem_count(self, workqueue_id: int, status: enums.WorkItemStatus):
         result = await self.session.execute(
-            select(func.count())
-            .where(WorkItem.workqueue_id == workqueue_id)
-            .where(WorkItem.status == status)
+            select(ITEM_COUNT).where(
+                WorkqueueItemCount.workqueue_id == workqueue_id,
+                WorkqueueItemCount.status == status,
+            )
         )
-        return result.scalar_one()
+        return result.scalar_one() or 0
 
     async def get_all_workitem_counts(
         self,
     ) -> dict[int, dict[enums.WorkItemStatus, int]]:
+        """Read the trigger-maintained counters instead of grouping workitem."""
         result = await self.session.execute(
-            select(WorkItem.workqueue_id, WorkItem.status, func.count()).group_by(
-                WorkItem.workqueue_id, WorkItem.status
-            )
+            select(
+                WorkqueueItemCount.workqueue_id,
+                WorkqueueItemCount.status,
+                ITEM_COUNT,
+            ).group_by(WorkqueueItemCount.workqueue_id, WorkqueueItemCount.status)
         )
         rows = result.all()
 
@@ -96,6 +172,44 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
 
         return counts
 
+    async def get_pending_workitem_counts(
+        self, workqueue_ids: list[int]
+    ) -> dict[int, int]:
+        """Count the NEW items of each workqueue that can be dequeued now.
+
+        Delayed items, including failed ones waiting out a retry backoff, are
+        NEW but not yet dequeueable. They are counted through
+        ix_workitem_not_before and subtracted from the NEW counter.
+        """
+        if not workqueue_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(WorkqueueItemCount.workqueue_id, ITEM_COUNT)
+            .where(
+                WorkqueueItemCount.workqueue_id.in_(workqueue_ids),
+                WorkqueueItemCount.status == enums.WorkItemStatus.NEW,
+            )
+            .group_by(WorkqueueItemCount.workqueue_id)
+        )
+        pending = {workqueue_id: count for workqueue_id, count in result.all()}
+
+        result = await self.session.execute(
+            select(WorkItem.workqueue_id, func.count())
+            .where(
+                WorkItem.workqueue_id.in_(workqueue_ids),
+                WorkItem.not_before > datetime.now(),
+                WorkItem.status == enums.WorkItemStatus.NEW,
+            )
+            .group_by(WorkItem.workqueue_id)
+        )
+        for workqueue_id, delayed in result.all():
+            pending[workqueue_id] = max(pending.get(workqueue_id, 0) - delayed, 0)
+
+        return {
+            workqueue_id: pending.get(workqueue_id, 0) for workqueue_id in workqueue_ids
+        }
+
     async def get_by_name(self, name: str) -> Workqueue:
         return (
             await self.session.scalars(select(Workqueue).filter(Workqueue.name == name))
@@ -108,7 +222,22 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
         skip: int = 0,
         limit: int = 10,
         include_deleted: bool = False,
-    ) -> tuple[List[WorkItem], int]:
+        after: tuple[datetime, int] | None = None,
+        total: enums.TotalCount = enums.TotalCount.EXACT,
+        fulltext: str | None = None,
+        data_contains: dict | None = None,
+    ) -> tuple[List[WorkItem], int | None]:
+        """Page through a queue's items, newest update first.
+
+        With `after` (the (updated_at, id) of the last item seen) the page is read
+        by keyset from the index, so its cost does not grow with depth; `skip`
+        is ignored. The total count always covers the whole filtered listing.
+
+        `search` is a substring match that scans every item of the queue.
+        `fulltext` matches whole words of the reference and data values and
+        `data_contains` matches items whose data contains the given object;
+        both are served by GIN indexes.
+        """
         query = select(WorkItem).where(WorkItem.workqueue_id == workqueue_id)
 
         if search:
@@ -119,15 +248,30 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
                     cast(WorkItem.data, String).ilike(f"%{search}%"),
                 )
             )
-        query = query.order_by(WorkItem.updated_at.desc())
+        if fulltext:
+            query = query.where(
+                WORKITEM_SEARCH_VECTOR.op("@@")(
+                    func.websearch_to_tsquery(
+                        literal_column("'simple'::regconfig"), fulltext
+                    )
+                )
+            )
+        if data_contains:
+            query = query.where(WorkItem.data.contains(data_contains))
+        query = query.order_by(WorkItem.updated_at.desc(), WorkItem.id.desc())
 
         count_query = select(func.count()).select_from(WorkItem)
         if query.whereclause is not None:
             count_query = count_query.where(query.whereclause)
 
-        total_count = (await self.session.execute(count_query)).scalar_one()
+        total_count = await self.count_total(count_query, total)
+
+        if after is not None:
+            query = query.where(tuple_(WorkItem.updated_at, WorkItem.id) < after)
+        else:
+            query = query.offset(skip)
 
-        items = (await self.session.scalars(query.offset(skip).limit(limit))).all()
+        items = (await self.session.scalars(query.limit(limit))).all()
 
         return (list(items), total_count)
 
@@ -137,17 +281,21 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
         workitem_status: enums.WorkItemStatus | None,
         days_older_than: int | None,
     ):
-        query = delete(WorkItem).where(WorkItem.workqueue_id == workqueue_id)
+        """Delete a queue's matching workitems, one committed id range at a time."""
+        conditions = [WorkItem.workqueue_id == workqueue_id]
 
         if workitem_status is not None:
-            query = query.where(WorkItem.status == workitem_status)
+            conditions.append(WorkItem.status == workitem_status)
 
         if days_older_than is not None:
             cutoff_date = datetime.now() - timedelta(days=days_older_than)
-            query = query.where(WorkItem.created_at < cutoff_date)
+            conditions.append(WorkItem.created_at < cutoff_date)
 
-        await self.session.execute(query)
-        await self.session.commit()
+        after_id = 0
+        while after_id is not None:
+            _, after_id = await self._delete_batch(
+                conditions, after_id, settings.auto_clean_batch_size
+            )
 
     async def get_auto_clean_workqueues(self) -> list[Workqueue]:
         """Get non-deleted workqueues with auto-clean enabled."""
@@ -161,17 +309,173 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
         self, workqueue_id: int, days: int
     ) -> int:
         """Delete completed/failed workitems not updated within the given number of days."""
+        deleted, after_id = 0, 0
+        while after_id is not None:
+            count, after_id = await self.clear_terminal_items_batch(
+                workqueue_id, days, after_id, settings.auto_clean_batch_size
+            )
+            deleted += count
+        return deleted
+
+    async def clear_terminal_items_batch(
+        self, workqueue_id: int, days: int, after_id: int, batch_size: int
+    ) -> tuple[int, int | None]:
+        """Delete up to `batch_size` expired completed/failed workitems with id > after_id.
+
+        Returns the number deleted and the id to continue after, or None once
+        no expired items are left.
+        """
         cutoff_date = datetime.now() - timedelta(days=days)
-        query = delete(WorkItem).where(
-            WorkItem.workqueue_id == workqueue_id,
-            WorkItem.status.in_(
-                [enums.WorkItemStatus.COMPLETED, enums.WorkItemStatus.FAILED]
-            ),
-            WorkItem.updated_at < cutoff_date,
+        return await self._delete_batch(
+            [
+                WorkItem.workqueue_id == workqueue_id,
+                WorkItem.status.in_(
+                    [enums.WorkItemStatus.COMPLETED, enums.WorkItemStatus.FAILED]
+                ),
+                WorkItem.updated_at < cutoff_date,
+            ],
+            after_id,
+            batch_size,
         )
-        result = await self.session.execute(query)
+
+    async def _delete_batch(
+        self, conditions: list, after_id: int, batch_size: int
+    ) -> tuple[int, int | None]:
+        """Delete the next `batch_size` matching workitems in id order and commit.
+
+        Keeping each transaction to one bounded id range keeps lock time and
+        WAL per commit small when millions of rows match.
+        """
+        batch = (
+            select(WorkItem.id)
+            .where(*conditions, WorkItem.id > after_id)
+            .order_by(WorkItem.id)
+            .limit(batch_size)
+        )
+        result = await self.session.execute(
+            delete(WorkItem)
+            .where(WorkItem.id.in_(batch))
+            .returning(WorkItem.id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = list(result.scalars())
+        await self.session.commit()
+
+        if len(ids) < batch_size:
+            return len(ids), None
+        return len(ids), max(ids)
+
+    async def requeue_expired_leases(self) -> dict[int, int]:
+        """Return in-progress items with an expired lease to NEW in one UPDATE.
+
+        Returns the number of requeued items per workqueue id.
+        """
+        now = datetime.now()
+        result = await self.session.execute(
+            update(WorkItem)
+            .where(
+                WorkItem.status == enums.WorkItemStatus.IN_PROGRESS,
+                WorkItem.lease_until < now,
+            )
+            .values(
+                status=enums.WorkItemStatus.NEW,
+                locked=False,
+                started_at=None,
+                lease_until=None,
+                updated_at=now,
+            )
+            .returning(WorkItem.workqueue_id)
+            .execution_options(synchronize_session=False)
+        )
+        requeued: dict[int, int] = defaultdict(int)
+        for workqueue_id in result.scalars():
+            requeued[workqueue_id] += 1
+
+        for workqueue_id in requeued:
+            await workqueue_notifier.publish(self.session, workqueue_id)
+        await self.session.commit()
+
+        for workqueue_id in requeued:
+            workqueue_notifier.notify(workqueue_id)
+        return dict(requeued)
+
+    async def release_delayed_items(self) -> dict[int, int]:
+        """Make delayed items whose `not_before` has passed dequeueable again.
+
+        Dequeuing claims due items directly; this pass wakes up requests
+        long-polling for them. Rows being claimed are skipped, not waited for.
+        Returns the released count per queue.
+        """
+        due = (
+            select(WorkItem.id)
+            .where(WorkItem.not_before <= datetime.now())
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(WorkItem)
+            .where(WorkItem.id.in_(due))
+            .values(not_before=None)
+            .returning(WorkItem.workqueue_id)
+            .execution_options(synchronize_session=False)
+        )
+        released: dict[int, int] = defaultdict(int)
+        for workqueue_id in result.scalars():
+            released[workqueue_id] += 1
+
+        for workqueue_id in released:
+            await workqueue_notifier.publish(self.session, workqueue_id)
+        await self.session.commit()
+
+        for workqueue_id in released:
+            workqueue_notifier.notify(workqueue_id)
+        return dict(released)
+
+    async def retry_failed_items(self) -> dict[int, int]:
+        """Return FAILED items with attempts left to NEW, in one UPDATE.
+
+        Applies to workqueues with `max_attempts` set, and only to items that
+        were dequeued and failed after it was enabled (`retry_policy_since`),
+        so turning retries on for an existing queue leaves its historic
+        failures alone. Each item becomes visible again after an exponential
+        backoff: `retry_backoff_seconds` doubled for every attempt after the
+        first, up to settings.retry_backoff_max_seconds. Returns the retried
+        count per queue.
+        """
+        now = datetime.now()
+        backoff = func.least(
+            Workqueue.retry_backoff_seconds
+            * func.power(2, func.least(func.greatest(WorkItem.attempts - 1, 0), 30)),
+            settings.retry_backoff_max_seconds,
+        )
+        result = await self.session.execute(
+            update(WorkItem)
+            .where(
+                WorkItem.workqueue_id == Workqueue.id,
+                Workqueue.deleted == False,  # noqa: E712
+                Workqueue.max_attempts != None,  # noqa: E711
+                WorkItem.status == enums.WorkItemStatus.FAILED,
+                WorkItem.attempts > 0,
+                WorkItem.attempts < Workqueue.max_attempts,
+                WorkItem.updated_at >= Workqueue.retry_policy_since,
+            )
+            .values(
+                status=enums.WorkItemStatus.NEW,
+                locked=False,
+                started_at=None,
+                lease_until=None,
+                not_before=literal(now, DateTime)
+                + func.make_interval(0, 0, 0, 0, 0, 0, backoff),
+                updated_at=now,
+            )
+            .returning(WorkItem.workqueue_id)
+            .execution_options(synchronize_session=False)
+        )
+        retried: dict[int, int] = defaultdict(int)
+        for workqueue_id in result.scalars():
+            retried[workqueue_id] += 1
+
         await self.session.commit()
-        return result.rowcount
+        return dict(retried)
 
     async def get_by_reference(
         self,
@@ -193,3 +497,66 @@ class WorkqueueRepository(DatabaseRepository[Workqueue]):
         query = query.order_by(WorkItem.created_at.desc())
 
         return list(await self.session.scalars(query))
+
+    async def get_by_references(
+        self,
+        workqueue_id: int,
+        references: list[str],
+        status: enums.WorkItemStatus | None = None,
+    ) -> dict[str, list[WorkItem]]:
+        """Resolve many references within a workqueue in one query.
+
+        Every non-blank reference requested is a key of the result; references
+        without items map to an empty list. Items are sorted newest to oldest.
+        """
+        found: dict[str, list[WorkItem]] = {
+            reference: [] for reference in references if reference.strip()
+        }
+        if not found:
+            return found
+
+        query = select(WorkItem).where(
+            WorkItem.workqueue_id == workqueue_id,
+            WorkItem.reference.in_(list(found)),
+        )
+
+        if status is not None:
+            query = query.where(WorkItem.status == status)
+
+        query = query.order_by(WorkItem.created_at.desc())
+
+        for item in await self.session.scalars(query):
+            found[item.reference].append(item)
+
+        return found
+
+    async def stream_workitems(
+        self,
+        workqueue_id: int,
+        status: enums.WorkItemStatus | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[WorkItem]:
+        """Yield a queue's items, newest first, through a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory use does not grow
+        with the size of the queue. The order follows the keyset index, which
+        lets the first rows arrive without sorting the whole queue.
+        """
+        query = select(WorkItem).where(WorkItem.workqueue_id == workqueue_id)
+
+        if status is not None:
+            query = query.where(WorkItem.status == status)
+        if created_after is not None:
+            query = query.where(WorkItem.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(WorkItem.created_at < created_before)
+
+        query = query.order_by(WorkItem.updated_at.desc(), WorkItem.id.desc())
+
+        result = await self.session.stream_scalars(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for item in result:
+            yield item
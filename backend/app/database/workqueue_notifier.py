@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "workitem_enqueued"
+
+# Seconds between attempts to restore a lost listener connection
+RECONNECT_DELAY_MIN = 1
+RECONNECT_DELAY_MAX = 60
+
+
+class WorkqueueNotifier:
+    """Wakes up requests waiting for work on a queue.
+
+    Enqueues fire `pg_notify` inside their transaction so every API process
+    listening on the channel learns about them on commit. Waiters in the
+    enqueuing process are also woken directly, so long-polling still works
+    when the listener connection is unavailable. A lost listener connection
+    is re-established in the background.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[int, set[asyncio.Event]] = defaultdict(set)
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+
+    @contextmanager
+    def subscribe(self, queue_id: int) -> Iterator[asyncio.Event]:
+        """Register interest in a queue before checking it, so no enqueue is missed."""
+        event = asyncio.Event()
+        self._waiters[queue_id].add(event)
+        try:
+            yield event
+        finally:
+            self._waiters[queue_id].discard(event)
+            if not self._waiters[queue_id]:
+                del self._waiters[queue_id]
+
+    def notify(self, queue_id: int) -> None:
+        for event in self._waiters.get(queue_id, ()):
+            event.set()
+
+    async def publish(self, session: AsyncSession, queue_id: int) -> None:
+        """Queue a notification on the session's transaction; delivered on commit."""
+        await session.execute(select(func.pg_notify(CHANNEL, str(queue_id))))
+
+    async def start(self) -> None:
+        self._stopping = False
+        if not await self._connect():
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _connect(self) -> bool:
+        connection = None
+        try:
+            connection = await asyncpg.connect(settings.database_url)
+            await connection.add_listener(CHANNEL, self._on_notification)
+            connection.add_termination_listener(self._on_termination)
+        except Exception as e:
+            if connection is not None:
+                connection.terminate()
+            logger.warning(
+                f"Workqueue notifications unavailable, long-polling falls back "
+                f"to in-process wake-ups: {e}"
+            )
+            return False
+
+        self._connection = connection
+        return True
+
+    def _schedule_reconnect(self) -> None:
+        if self._stopping or (
+            self._reconnect_task is not None and not self._reconnect_task.done()
+        ):
+            return
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_DELAY_MIN
+        while not self._stopping:
+            await asyncio.sleep(delay)
+            if await self._connect():
+                logger.info("Workqueue notifications listener reconnected")
+                # Enqueues may have gone unnoticed meanwhile; let waiters recheck
+                for queue_id in list(self._waiters):
+                    self.notify(queue_id)
+                return
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    def _on_termination(self, connection) -> None:
+        if connection is self._connection:
+            self._connection = None
+        self._schedule_reconnect()
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self.notify(int(payload))
+        except ValueError:
+            logger.warning(f"Ignoring malformed workqueue notification: {payload!r}")
+
+
+workqueue_notifier = WorkqueueNotifier()
@@ -32,6 +32,26 @@ class SessionStatus(str, enum.Enum):
         return new_status in transition_map[self]
 
 
+class TotalCount(str, enum.Enum):
+    """How paginated endpoints compute `total_items`."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class DispatchMode(str, enum.Enum):
+    """How the scheduler matches pending sessions to free resources."""
+
+    GREEDY = "greedy"
+    MATCHING = "matching"
+
+
+class WorkItemFileFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TriggerType(str, enum.Enum):
     CRON = "cron"
     WORKQUEUE = "workqueue"
@@ -20,6 +20,7 @@ from app.api.v1.trigger_router import router as v1_trigger_router
 from app.api.v1.workitem_router import router as v1_workitem_router
 from app.api.v1.workqueue_router import router as v1_workqueue_router
 from app.config import settings
+from app.database.workqueue_notifier import workqueue_notifier
 from app.scheduler import scheduler_background_task
 
 logging.basicConfig(level=logging.INFO if settings.debug else logging.WARNING)
@@ -36,6 +37,7 @@ except PackageNotFoundError:
 async def lifespan(app: FastAPI):
     # Create and store scheduler task reference to prevent garbage collection
     scheduler_task = asyncio.create_task(scheduler_background_task())
+    await workqueue_notifier.start()
 
     logger.info(
         f"Starting up, database url is: {settings.database_url}, debug is {settings.debug}"
@@ -44,6 +46,8 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        await workqueue_notifier.stop()
+
         # Graceful shutdown: cancel scheduler task
         if scheduler_task and not scheduler_task.done():
             logger.info("Shutting down scheduler...")
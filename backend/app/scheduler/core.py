@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.database.partitioning import maintain_partitions
 from app.database.repository import (
     AuditLogRepository,
     IncidentRepository,
@@ -22,6 +23,7 @@ from app.database.repository import (
 )
 from app.database.session import async_engine
 from app.services import (
+    AutoCleanProgress,
     IncidentService,
     ResourceService,
     SessionService,
@@ -29,7 +31,11 @@ from app.services import (
 )
 
 from .dispatcher import ResourceDispatcher
-from .trigger_processors import ProcessingServices, TriggerProcessorRegistry
+from .trigger_processors import (
+    ProcessingServices,
+    TriggerContext,
+    TriggerProcessorRegistry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +48,8 @@ class AutomationScheduler:
         self.processor_registry = None
         self.dispatcher = None
         self._last_auto_clean: datetime | None = None
+        self._auto_clean_progress = AutoCleanProgress()
+        self._last_partition_maintenance: datetime | None = None
 
     async def run_background_task(self):
         """Background task that runs the scheduler in a loop."""
@@ -104,13 +112,29 @@ class AutomationScheduler:
             await session_service.reschedule_orphaned_sessions()
             await session_service.flush_dangling_sessions()
             await incident_service.create_incidents_for_new_failures()
-
-            # Auto-clean workqueues at most once per hour
-            if self._last_auto_clean is None or (
+            await workqueue_service.requeue_expired_leases()
+            await workqueue_service.retry_failed_items()
+            await workqueue_service.release_delayed_items()
+
+            # Start an auto-clean pass at most once per hour. A pass spends at
+            # most the time budget per run and resumes on the next one, so a
+            # large backlog never stalls dispatching.
+            auto_clean_due = self._last_auto_clean is None or (
                 datetime.now() - self._last_auto_clean
-            ) >= timedelta(hours=1):
-                await workqueue_service.auto_clean_workqueues()
-                self._last_auto_clean = datetime.now()
+            ) >= timedelta(hours=1)
+            if self._auto_clean_progress.in_progress or auto_clean_due:
+                if not self._auto_clean_progress.in_progress:
+                    self._last_auto_clean = datetime.now()
+                await workqueue_service.auto_clean_workqueues(
+                    self._auto_clean_progress, settings.auto_clean_time_budget
+                )
+
+            # Keep monthly partitions ahead of inserts and drop expired ones
+            if self._last_partition_maintenance is None or (
+                datetime.now() - self._last_partition_maintenance
+            ) >= timedelta(days=1):
+                self._last_partition_maintenance = datetime.now()
+                await maintain_partitions(session)
 
             # Dispatch pending sessions first
             await self.dispatcher.dispatch_all_pending()
@@ -119,7 +143,7 @@ class AutomationScheduler:
             now = datetime.now()
 
             # Process all triggers
-            await self._process_triggers(trigger_repository, process_repository, now)
+            await self._process_triggers(trigger_repository, now)
 
             # Dispatch again for any new sessions created
             await self.dispatcher.dispatch_all_pending()
@@ -127,27 +151,24 @@ class AutomationScheduler:
     async def _process_triggers(
         self,
         trigger_repository: TriggerRepository,
-        process_repository: ProcessRepository,
         now: datetime,
     ):
         """Process all enabled triggers.
 
         Args:
             trigger_repository: Repository for trigger operations
-            process_repository: Repository for process operations
             now: Current datetime for trigger evaluation
         """
-        triggers = await trigger_repository.get_all(include_deleted=False)
-
-        for trigger in triggers:
-            if not trigger.enabled:
-                continue
+        # Enabled triggers of non-deleted processes, with the process loaded
+        triggers = await trigger_repository.get_enabled_with_process()
+        if not triggers:
+            return
 
-            # Check if the associated process exists and is not deleted
-            process = await process_repository.get(trigger.process_id)
-            if process is None or process.deleted:
-                continue
+        # Prefetch what the processors need for all triggers at once
+        services = self.processor_registry.services
+        services.context = await TriggerContext.load(services, triggers)
 
+        for trigger in triggers:
             try:
                 # Get the appropriate processor for this trigger type
                 processor = self.processor_registry.get_processor(trigger.type)
@@ -0,0 +1,154 @@
+"""
+In-memory matching of pending sessions to free resources.
+
+The dispatcher builds one engine per tick from a single read of the free
+resources, matches every pending session without further queries and writes
+the assignments back in one statement.
+"""
+
+from collections import deque
+
+from app.database.models import Resource, Session
+
+from .utils import parse_capability_set
+
+
+class DispatchEngine:
+    """Assigns sessions to the free resources of one dispatcher tick.
+
+    The pool is ordered by number of capabilities, so the first resource that
+    satisfies a session is also its best fit, the same choice
+    `find_best_resource` makes. Taken resources leave the pool.
+    """
+
+    def __init__(self, resources: list[Resource]) -> None:
+        pool = [
+            (parse_capability_set(resource.capabilities), resource)
+            for resource in resources
+        ]
+        # Stable sort: ties keep their order, as in find_best_resource
+        pool.sort(key=lambda entry: len(entry[0]))
+        self._pool = pool
+        # The pool only shrinks, so requirements that failed once keep failing
+        self._unsatisfiable: set[frozenset[str]] = set()
+
+    @property
+    def free_resources(self) -> int:
+        return len(self._pool)
+
+    def take(self, requirements: str) -> Resource | None:
+        """Remove and return the best free resource for `requirements`, if any."""
+        required = parse_capability_set(requirements)
+        if required in self._unsatisfiable:
+            return None
+
+        for index, (capabilities, resource) in enumerate(self._pool):
+            if required <= capabilities:
+                del self._pool[index]
+                return resource
+
+        self._unsatisfiable.add(required)
+        return None
+
+    def assign(self, sessions: list[Session]) -> list[tuple[Session, Resource]]:
+        """Match sessions in the given order (FIFO) to free resources."""
+        assignments = []
+        for session in sessions:
+            if not self._pool:
+                break
+
+            resource = self.take(_requirements(session))
+            if resource is not None:
+                assignments.append((session, resource))
+
+        return assignments
+
+    def assign_matching(
+        self, sessions: list[Session]
+    ) -> list[tuple[Session, Resource]]:
+        """Match as many sessions as possible, preferring those earlier in the list.
+
+        Sessions are added oldest first; each one gets a free resource or, if
+        none is left, resources are shuffled between already matched sessions
+        along an augmenting path. A matched session is never dropped, so the
+        result is a maximum matching that favours FIFO age the way a greedy
+        pick over a matroid does. Without contention every session gets the
+        resource `assign` would give it.
+        """
+        capabilities = [caps for caps, _ in self._pool]
+        candidates: dict[frozenset[str], list[int]] = {}
+        # Resource index -> session index and back
+        owner: dict[int, int] = {}
+        matched: dict[int, int] = {}
+
+        for index, session in enumerate(sessions):
+            if len(owner) == len(self._pool):
+                break
+
+            required = parse_capability_set(_requirements(session))
+            if required in self._unsatisfiable:
+                continue
+            if required not in candidates:
+                candidates[required] = [
+                    i for i, caps in enumerate(capabilities) if required <= caps
+                ]
+
+            path = self._augmenting_path(index, sessions, candidates, owner)
+            if path is None:
+                # The set of matchable sessions only grows by supersets, so
+                # these requirements stay unsatisfiable for the rest of the tick
+                self._unsatisfiable.add(required)
+                continue
+
+            for session_index, resource_index in path:
+                owner[resource_index] = session_index
+                matched[session_index] = resource_index
+
+        assignments = [
+            (sessions[session_index], self._pool[matched[session_index]][1])
+            for session_index in sorted(matched)
+        ]
+        self._pool = [
+            entry for index, entry in enumerate(self._pool) if index not in owner
+        ]
+        return assignments
+
+    def _augmenting_path(
+        self,
+        start: int,
+        sessions: list[Session],
+        candidates: dict[frozenset[str], list[int]],
+        owner: dict[int, int],
+    ) -> list[tuple[int, int]] | None:
+        """Breadth-first search for a free resource reachable from `start`.
+
+        Returns the (session, resource) edges to apply, or None. Candidates are
+        visited in pool order, so a directly free best-fit resource wins.
+        """
+        parent: dict[int, tuple[int, int | None]] = {}
+        queue = deque([(start, None)])
+        while queue:
+            session_index, via = queue.popleft()
+            required = parse_capability_set(_requirements(sessions[session_index]))
+            for resource_index in candidates[required]:
+                if resource_index in parent:
+                    continue
+                parent[resource_index] = (session_index, via)
+
+                if resource_index in owner:
+                    queue.append((owner[resource_index], resource_index))
+                    continue
+
+                # Walk back to the start, moving each session one resource on
+                path = []
+                while resource_index is not None:
+                    session_index, via = parent[resource_index]
+                    path.append((session_index, resource_index))
+                    resource_index = via
+                return path
+
+        return None
+
+
+def _requirements(session: Session) -> str:
+    return session.process.requirements if session.process else ""
@@ -5,13 +5,14 @@ This module handles complex session-to-resource dispatching logic for the schedu
 """
 
 import logging
-from datetime import datetime
 
-from app.database.models import Resource, Session
+from app.config import settings
 from app.database.repository import SessionRepository
-from app.enums import SessionStatus
+from app.enums import DispatchMode, SessionStatus
 from app.services import ResourceService
 
+from .dispatch_engine import DispatchEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,9 +46,6 @@ class ResourceDispatcher:
 
     async def _dispatch_pending_sessions(self):
         """Internal method to handle the complex dispatching logic."""
-        # Import here to avoid circular imports
-        from app.scheduler.utils import find_best_resource
-
         # Update resource availability first
         await self.resource_service.update_availability()
 
@@ -60,37 +58,26 @@ class ResourceDispatcher:
             for session in sessions
             if session.status == SessionStatus.NEW and session.resource_id is None
         ]
+        if not pending_sessions:
+            return
 
         # Sort by creation time (FIFO)
         pending_sessions.sort(key=lambda s: s.created_at)
 
-        # Process each pending session
-        for session in pending_sessions:
-            available_resources = (
-                await self.resource_service.repository.get_available_resources()
+        # Match in memory against one read of the free resources, then write
+        # every assignment back at once
+        available_resources = (
+            await self.resource_service.repository.get_available_resources()
+        )
+        engine = DispatchEngine(available_resources)
+        if settings.dispatch_mode == DispatchMode.MATCHING:
+            assignments = engine.assign_matching(pending_sessions)
+        else:
+            assignments = engine.assign(pending_sessions)
+        applied = await self.session_repository.assign_resources(assignments)
+
+        if len(applied) < len(pending_sessions):
+            logger.debug(
+                f"{len(pending_sessions) - len(applied)} pending sessions are "
+                f"waiting for a resource"
             )
-            requirements = session.process.requirements if session.process else ""
-
-            best_resource = find_best_resource(requirements, available_resources)
-
-            if best_resource is None:
-                # Log that no resources are available (but don't fail the session)
-                continue
-
-            # Assign the session to the best resource
-            await self._assign_session_to_resource(session, best_resource)
-
-    async def _assign_session_to_resource(self, session: Session, resource: Resource):
-        """Assign a session to a resource and update both entities.
-
-        Args:
-            session: Session to assign
-            resource: Resource to assign to
-        """
-        data = session.model_dump()
-
-        data["resource_id"] = resource.id
-        data["dispatched_at"] = datetime.now()
-
-        await self.session_repository.update(session, data)
-        await self.resource_service.repository.update(resource, {"available": False})
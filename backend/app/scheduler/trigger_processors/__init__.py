@@ -5,6 +5,7 @@ Contains the strategy pattern implementation for different trigger types.
 """
 
 from .base import AbstractTriggerProcessor, ProcessingServices
+from .context import TriggerContext
 from .cron import CronTriggerProcessor
 from .date import DateTriggerProcessor
 from .registry import TriggerProcessorRegistry
@@ -13,6 +14,7 @@ from .workqueue import WorkqueueTriggerProcessor
 __all__ = [
     "AbstractTriggerProcessor",
     "ProcessingServices",
+    "TriggerContext",
     "CronTriggerProcessor",
     "DateTriggerProcessor",
     "WorkqueueTriggerProcessor",
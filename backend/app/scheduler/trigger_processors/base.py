@@ -7,6 +7,7 @@ This module defines the abstract interface that all trigger processors must impl
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from app.database.models import Trigger
 from app.database.repository import (
@@ -19,12 +20,18 @@ from app.database.repository import (
 from app.scheduler.validators import validate_parameters
 from app.services import ResourceService, SessionService, WorkqueueService
 
+if TYPE_CHECKING:
+    from .context import TriggerContext
+
 logger = logging.getLogger(__name__)
 
 
 class ProcessingServices:
     """Container for services and repositories needed by trigger processors."""
 
+    # Data prefetched for the triggers of the current tick, see TriggerContext
+    context: "TriggerContext | None" = None
+
     def __init__(
         self,
         session_service: SessionService,
@@ -141,6 +148,9 @@ class AbstractTriggerProcessor(ABC):
             )
 
             if session:
+                if self.services.context is not None:
+                    self.services.context.add_session(session)
+
                 # Update last_triggered timestamp after successful session creation
                 await self.services.trigger_repository.update(
                     trigger, {"last_triggered": datetime.now()}
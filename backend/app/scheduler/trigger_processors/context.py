@@ -0,0 +1,97 @@
+"""
+Per-tick trigger context.
+
+Loads what the trigger processors need for all triggers of a scheduler tick
+in a few queries, instead of once per trigger.
+"""
+
+from collections import defaultdict
+
+from app.database.models import Session, Trigger, Workqueue
+from app.enums import TriggerType
+from app.scheduler.utils import parse_capability_set
+
+from .base import ProcessingServices
+
+
+class TriggerContext:
+    """Workqueues, dequeueable item counts and active sessions for one tick."""
+
+    def __init__(
+        self,
+        services: ProcessingServices,
+        workqueues: dict[int, Workqueue],
+        pending_items: dict[int, int],
+        active_sessions: dict[int, list[Session]],
+    ):
+        self.services = services
+        self.workqueues = workqueues
+        self.pending_items = pending_items
+        self._active_sessions = active_sessions
+        self._resources_available: dict[frozenset[str], bool] = {}
+
+    @classmethod
+    async def load(
+        cls, services: ProcessingServices, triggers: list[Trigger]
+    ) -> "TriggerContext":
+        """Load the context for `triggers`.
+
+        Args:
+            services: Container with the repositories to load from
+            triggers: The triggers about to be processed
+
+        Returns:
+            TriggerContext for the tick
+        """
+        workqueue_ids = {
+            trigger.workqueue_id
+            for trigger in triggers
+            if trigger.type == TriggerType.WORKQUEUE and trigger.workqueue_id
+        }
+
+        workqueues = {}
+        pending_items = {}
+        if workqueue_ids:
+            workqueues = {
+                workqueue.id: workqueue
+                for workqueue in await services.workqueue_repository.filter(
+                    Workqueue.id.in_(workqueue_ids)
+                )
+            }
+            pending_items = (
+                await services.workqueue_repository.get_pending_workitem_counts(
+                    sorted(workqueue_ids)
+                )
+            )
+
+        active_sessions = defaultdict(list)
+        for session in await services.session_repository.get_active_sessions():
+            active_sessions[session.process_id].append(session)
+
+        return cls(services, workqueues, pending_items, active_sessions)
+
+    def get_workqueue(self, workqueue_id: int) -> Workqueue | None:
+        return self.workqueues.get(workqueue_id)
+
+    def count_pending_items(self, workqueue_id: int) -> int:
+        return self.pending_items.get(workqueue_id, 0)
+
+    def get_active_sessions(self, process_id: int) -> list[Session]:
+        return self._active_sessions[process_id]
+
+    def add_session(self, session: Session) -> None:
+        """Count a session created during the tick as active for its process."""
+        self._active_sessions[session.process_id].append(session)
+
+    async def are_resources_available(self, requirements: str) -> bool:
+        """Check for a free resource with `requirements`, once per requirement set.
+
+        New sessions don't take a resource until they are dispatched after the
+        triggers are processed, so the answer holds for the whole tick.
+        """
+        required = parse_capability_set(requirements)
+        if required not in self._resources_available:
+            self._resources_available[
+                required
+            ] = await self.services.resource_repository.has_available_resource(required)
+        return self._resources_available[required]
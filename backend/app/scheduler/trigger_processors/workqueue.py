@@ -6,16 +6,12 @@ This module implements the trigger processor for workqueue-based scheduling.
 
 import logging
 from datetime import datetime
-from typing import List
 
 from app.database.models import Trigger
-from app.scheduler.utils import (
-    calculate_required_sessions,
-    find_best_resource,
-    should_scale_up,
-)
+from app.scheduler.utils import calculate_required_sessions, should_scale_up
 
 from .base import AbstractTriggerProcessor
+from .context import TriggerContext
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +33,13 @@ class WorkqueueTriggerProcessor(AbstractTriggerProcessor):
             True if processing was successful
         """
         try:
+            # Use the tick's prefetched data, or load it for just this trigger
+            context = self.services.context or await TriggerContext.load(
+                self.services, [trigger]
+            )
+
             # Get the workqueue
-            workqueue = await self._get_workqueue(trigger)
+            workqueue = self._get_workqueue(trigger, context)
             if not workqueue:
                 return True  # Continue processing other triggers
 
@@ -46,9 +47,7 @@ class WorkqueueTriggerProcessor(AbstractTriggerProcessor):
                 return True  # Skip disabled workqueues
 
             # Check for pending work items
-            pending_items = await self.services.workqueue_service.count_pending_items(
-                trigger.workqueue_id
-            )
+            pending_items = context.count_pending_items(trigger.workqueue_id)
 
             # Calculate how many sessions we need
             required_sessions = calculate_required_sessions(
@@ -59,9 +58,7 @@ class WorkqueueTriggerProcessor(AbstractTriggerProcessor):
                 return True  # No work to do
 
             # Check current active sessions for this process
-            active_sessions = await self._get_active_sessions_for_process(
-                trigger.process_id
-            )
+            active_sessions = context.get_active_sessions(trigger.process_id)
 
             # Decide if we should scale up
             if should_scale_up(
@@ -74,7 +71,7 @@ class WorkqueueTriggerProcessor(AbstractTriggerProcessor):
                 )
 
                 # Check if resources are available before creating session
-                if await self._are_resources_available(trigger):
+                if await self._are_resources_available(trigger, context):
                     # Only trigger one session per tick to allow other processes to scale
                     return await self._create_session(
                         trigger, validated_params, force=True
@@ -91,86 +88,51 @@ class WorkqueueTriggerProcessor(AbstractTriggerProcessor):
             logger.error(f"Error processing workqueue trigger {trigger.id}: {e}")
             return False
 
-    async def _get_workqueue(self, trigger: Trigger):
+    def _get_workqueue(self, trigger: Trigger, context: TriggerContext):
         """Get the workqueue for a trigger.
 
         Args:
             trigger: The trigger to get workqueue for
+            context: Prefetched data for the tick
 
         Returns:
             Workqueue object or None if not found
         """
-        try:
-            if not trigger.workqueue_id:
-                logger.error(f"Workqueue trigger {trigger.id} has no workqueue_id")
-                return None
-
-            workqueue = await self.services.workqueue_repository.get(
-                trigger.workqueue_id
-            )
-
-            if workqueue is None:
-                logger.error(f"Workqueue {trigger.workqueue_id} does not exist")
-                return None
-
-            return workqueue
-
-        except Exception as e:
-            logger.error(f"Error getting workqueue {trigger.workqueue_id}: {e}")
+        if not trigger.workqueue_id:
+            logger.error(f"Workqueue trigger {trigger.id} has no workqueue_id")
             return None
 
-    async def _get_active_sessions_for_process(self, process_id: int) -> List:
-        """Get active sessions for a specific process.
-
-        Args:
-            process_id: The process ID to filter by
+        workqueue = context.get_workqueue(trigger.workqueue_id)
 
-        Returns:
-            List of active sessions for the process
-        """
-        try:
-            active_sessions = (
-                await self.services.session_repository.get_active_sessions()
-            )
-            return [
-                session
-                for session in active_sessions
-                if session.process_id == process_id
-            ]
+        if workqueue is None:
+            logger.error(f"Workqueue {trigger.workqueue_id} does not exist")
+            return None
 
-        except Exception as e:
-            logger.error(f"Error getting active sessions for process {process_id}: {e}")
-            return []
+        return workqueue
 
-    async def _are_resources_available(self, trigger: Trigger) -> bool:
+    async def _are_resources_available(
+        self, trigger: Trigger, context: TriggerContext
+    ) -> bool:
         """Check if resources are available for a trigger.
 
         Args:
             trigger: The trigger to check resources for
+            context: Prefetched data for the tick
 
         Returns:
             True if resources are available
         """
         try:
-            # Get the process to check its requirements
-            process = await self.services.process_repository.get(trigger.process_id)
+            # The process is loaded together with the trigger
+            process = trigger.process
             if process is None:
                 logger.error(
                     f"Process {trigger.process_id} not found for trigger {trigger.id}"
                 )
                 return False
 
-            # Get available resources
-            available_resources = (
-                await self.services.resource_repository.get_available_resources()
-            )
-
-            # Check if any resource can satisfy the requirements
-            best_resource = find_best_resource(
-                process.requirements, available_resources
-            )
-
-            return best_resource is not None
+            # Check if any free resource can satisfy the requirements
+            return await context.are_resources_available(process.requirements)
 
         except Exception as e:
             logger.error(f"Error checking resources for trigger {trigger.id}: {e}")
@@ -6,7 +6,9 @@ for resource matching and other common operations.
 """
 
 import re
-from typing import List, Optional, Set
+import sys
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Set
 
 from app.database.models import Resource
 
@@ -27,6 +29,19 @@ def parse_capabilities_or_requirements(string: str) -> Set[str]:
     return set(re.split(r"[ ,]+", string.strip()))
 
 
+@lru_cache(maxsize=4096)
+def parse_capability_set(string: str) -> FrozenSet[str]:
+    """Parse and cache a capabilities or requirements string as a frozenset.
+
+    The strings repeat across resources, sessions and scheduler runs, so each
+    distinct one is only split once. Names are interned to make the subset
+    checks compare pointers.
+    """
+    return frozenset(
+        sys.intern(name) for name in parse_capabilities_or_requirements(string)
+    )
+
+
 def find_best_resource(
     requirements: str, resources: List[Resource]
 ) -> Optional[Resource]:
@@ -43,14 +58,12 @@ def find_best_resource(
     if not resources:
         return None
 
-    session_requirements = parse_capabilities_or_requirements(requirements)
+    session_requirements = parse_capability_set(requirements)
     best_resource = None
     least_capabilities = float("inf")
 
     for resource in resources:
-        resource_capabilities = parse_capabilities_or_requirements(
-            resource.capabilities
-        )
+        resource_capabilities = parse_capability_set(resource.capabilities)
 
         # Check if resource can satisfy all requirements
         if session_requirements.issubset(resource_capabilities):
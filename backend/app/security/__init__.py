@@ -1 +1,3 @@
 from .oauth2 import oauth2_scheme as oauth2_scheme
+from .token_cache import AccessTokenCache as AccessTokenCache
+from .token_cache import access_token_cache as access_token_cache
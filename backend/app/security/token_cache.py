@@ -0,0 +1,63 @@
+import time
+from datetime import datetime
+
+from app.config import settings
+from app.database.models import AccessToken
+
+
+class AccessTokenCache:
+    """Short-lived, in-process cache of validated access tokens.
+
+    Only tokens that passed validation are stored, so the cache is bounded by
+    the number of tokens in the database. Entries are trusted for `ttl_seconds`
+    (or until the token itself expires); other API processes pick up deletions
+    once their entries age out.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._tokens: dict[str, tuple[AccessToken, float]] = {}
+        self._auth_enforced: tuple[bool, float] | None = None
+
+    def get(self, token: str) -> AccessToken | None:
+        entry = self._tokens.get(token)
+        if entry is None:
+            return None
+
+        access_token, cached_until = entry
+        if (
+            cached_until <= time.monotonic()
+            or access_token.expires_at <= datetime.now()
+        ):
+            self._tokens.pop(token, None)
+            return None
+
+        return access_token
+
+    def put(self, access_token: AccessToken) -> None:
+        self._tokens[access_token.access_token] = (
+            access_token,
+            time.monotonic() + self.ttl_seconds,
+        )
+
+    def get_auth_enforced(self) -> bool | None:
+        """Return the cached "are there any active tokens" flag, if still fresh."""
+        if self._auth_enforced is None:
+            return None
+
+        enforced, cached_until = self._auth_enforced
+        if cached_until <= time.monotonic():
+            self._auth_enforced = None
+            return None
+
+        return enforced
+
+    def set_auth_enforced(self, enforced: bool) -> None:
+        self._auth_enforced = (enforced, time.monotonic() + self.ttl_seconds)
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._auth_enforced = None
+
+
+access_token_cache = AccessTokenCache(settings.access_token_cache_ttl)
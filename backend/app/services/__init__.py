@@ -2,4 +2,5 @@ from .auditlog_service import AuditLogService as AuditLogService
 from .incident_service import IncidentService as IncidentService
 from .resource_service import ResourceService as ResourceService
 from .session_service import SessionService as SessionService
+from .workqueue_service import AutoCleanProgress as AutoCleanProgress
 from .workqueue_service import WorkqueueService as WorkqueueService
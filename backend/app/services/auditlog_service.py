@@ -3,6 +3,7 @@ from typing import Optional
 from app.api.v1.schemas import PaginatedResponse
 from app.database.models import AuditLog
 from app.database.repository import AuditLogRepository
+from app.enums import TotalCount
 
 
 class AuditLogService:
@@ -15,19 +16,23 @@ class AuditLogService:
         page: int = 1,
         size: int = 10,
         search: Optional[str] = None,
+        total: TotalCount = TotalCount.EXACT,
     ) -> PaginatedResponse[AuditLog]:
         skip = (page - 1) * size
         logs, total_items = await self.repository.get_paginated(
-            session_id, search, skip, size
+            session_id, search, skip, size, total=total
         )
 
-        total_pages = (total_items + size - 1) // size
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + size - 1) // size
 
         response = PaginatedResponse[AuditLog](
             page=page,
             size=size,
             total_items=total_items,
             total_pages=total_pages,
+            total_estimated=total == TotalCount.ESTIMATED,
             items=logs,
         )
 
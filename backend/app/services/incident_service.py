@@ -8,7 +8,7 @@ from app.database.repository import (
     IncidentRepository,
     SessionRepository,
 )
-from app.enums import IncidentStatus
+from app.enums import IncidentStatus, TotalCount
 from app.services.session_service import SessionService
 
 logger = logging.getLogger(__name__)
@@ -124,17 +124,21 @@ class IncidentService:
         size: int = 50,
         search: Optional[str] = None,
         status: Optional[IncidentStatus] = None,
+        total: TotalCount = TotalCount.EXACT,
     ) -> PaginatedResponse[Incident]:
         skip = (page - 1) * size
         incidents, total_items = await self.repository.get_paginated(
-            search, status, skip, size
+            search, status, skip, size, total=total
         )
-        total_pages = (total_items + size - 1) // size
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + size - 1) // size
 
         return PaginatedResponse[Incident](
             page=page,
             size=size,
             total_items=total_items,
             total_pages=total_pages,
+            total_estimated=total == TotalCount.ESTIMATED,
             items=incidents,
         )
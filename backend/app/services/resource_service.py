@@ -16,19 +16,24 @@ class ResourceService:
 
     async def update_availability(self):
         resources = await self.repository.get_all()
-
-        for resource in resources:
-            if (
-                resource.last_seen < datetime.now() - timedelta(minutes=10)
-                and not resource.deleted
-            ):
-                # Only detach the resource if there are no in-progress sessions
-                if not any(
-                    x.status == SessionStatus.IN_PROGRESS
-                    and x.resource_id == resource.id
-                    for x in await self.session_repository.get_active_sessions()
-                ):
-                    await self.detach(resource)
+        stale = [
+            resource
+            for resource in resources
+            if resource.last_seen < datetime.now() - timedelta(minutes=10)
+            and not resource.deleted
+        ]
+        if not stale:
+            return
+
+        # Only detach the resource if there are no in-progress sessions
+        busy = {
+            x.resource_id
+            for x in await self.session_repository.get_active_sessions()
+            if x.status == SessionStatus.IN_PROGRESS
+        }
+        for resource in stale:
+            if resource.id not in busy:
+                await self.detach(resource)
 
     async def enroll(self, fqdn: str, name: str, capabilities: str):
         previous = await self.repository.get_by_fqdn(fqdn)
@@ -4,7 +4,7 @@ from typing import Optional
 from app.api.v1.schemas import PaginatedResponse
 from app.database.models import Session
 from app.database.repository import ResourceRepository, SessionRepository
-from app.enums import SessionStatus
+from app.enums import SessionStatus, TotalCount
 
 
 class SessionService:
@@ -22,18 +22,22 @@ class SessionService:
         size: int = 10,
         search: Optional[str] = None,
         include_deleted: bool = False,
+        total: TotalCount = TotalCount.EXACT,
     ) -> PaginatedResponse[Session]:
         skip = (page - 1) * size
         sessions, total_items = await self.repository.get_paginated(
-            search, skip, size, include_deleted
+            search, skip, size, include_deleted, total=total
         )
-        total_pages = (total_items + size - 1) // size
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + size - 1) // size
 
         response = PaginatedResponse[Session](
             page=page,
             size=size,
             total_items=total_items,
             total_pages=total_pages,
+            total_estimated=total == TotalCount.ESTIMATED,
             items=sessions,
         )
 
@@ -1,17 +1,192 @@
+import codecs
+import csv
+import io
+import json
 import logging
-from typing import Optional
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional
 
-from app.api.v1.schemas import PaginatedResponse
+from pydantic import ValidationError
+
+from app.api.v1.schemas import (
+    KeysetCursor,
+    PaginatedResponse,
+    WorkItemCreate,
+    WorkItemImportError,
+    WorkItemImportResult,
+    WorkItemRead,
+)
+from app.config import settings
 from app.database.models import WorkItem
-from app.database.repository import WorkqueueRepository
-from app.enums import WorkItemStatus
+from app.database.repository import WorkItemRepository, WorkqueueRepository
+from app.enums import TotalCount, WorkItemFileFormat, WorkItemStatus
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched from the cursor, and written to the response, per chunk
+EXPORT_BATCH_SIZE = 1000
+# Rows inserted and committed together by an import
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100
+# Bounds on what an import buffers for one line or multi-line CSV record
+MAX_IMPORT_RECORD_SIZE = 1024 * 1024
+MAX_IMPORT_RECORD_LINES = 1000
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str | None]:
+    """Split a UTF-8 byte stream into lines without reading all of it.
+
+    Lines longer than MAX_IMPORT_RECORD_SIZE characters are not buffered;
+    None is yielded in their place.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    parts: list[str] = []
+    size = 0
+
+    def join(tail: str) -> str | None:
+        if size + len(tail) > MAX_IMPORT_RECORD_SIZE:
+            return None
+        return ("".join(parts) + tail).rstrip("\r")
+
+    async for chunk in chunks:
+        *lines, tail = decoder.decode(chunk).split("\n")
+        for line in lines:
+            yield join(line)
+            parts, size = [], 0
+        if size <= MAX_IMPORT_RECORD_SIZE:
+            parts.append(tail)
+        size += len(tail)
+
+    tail = decoder.decode(b"", final=True)
+    if size or tail:
+        yield join(tail)
+
+
+class _CsvRecordSplitter:
+    """Groups CSV lines into records, so quoted fields may contain newlines.
+
+    A record ends on the first line where its quotes are balanced. A record
+    still open after MAX_IMPORT_RECORD_LINES lines or MAX_IMPORT_RECORD_SIZE
+    characters, or at the end of the stream, is reported as unterminated at
+    its first line, and the lines after that one are read again as new records.
+    """
+
+    def __init__(self) -> None:
+        self._lines: list[tuple[int, str]] = []
+        self._quotes = 0
+        self._size = 0
+
+    def feed(self, line_number: int, line: str) -> Iterator[tuple[int, str | None]]:
+        todo = deque([(line_number, line)])
+        while todo:
+            line_number, line = todo.popleft()
+            self._lines.append((line_number, line))
+            self._quotes += line.count('"')
+            self._size += len(line)
+            if self._quotes % 2 == 0:
+                yield self._lines[0][0], "\n".join(text for _, text in self._lines)
+                self._clear()
+            elif (
+                len(self._lines) > MAX_IMPORT_RECORD_LINES
+                or self._size > MAX_IMPORT_RECORD_SIZE
+            ):
+                yield self._lines[0][0], None
+                todo.extendleft(reversed(self._clear()[1:]))
+
+    def finish(self) -> Iterator[tuple[int, str | None]]:
+        while self._lines:
+            (line_number, _), *rest = self._clear()
+            yield line_number, None
+            for line_number, line in rest:
+                yield from self.feed(line_number, line)
+
+    def _clear(self) -> list[tuple[int, str]]:
+        lines = self._lines
+        self._lines, self._quotes, self._size = [], 0, 0
+        return lines
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes], format: WorkItemFileFormat
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """Yield each record of the stream with the line number it starts on.
+
+    An NDJSON record is one line; CSV records are split by _CsvRecordSplitter.
+    Records that cannot be read are yielded as the ValueError describing why.
+    """
+    splitter = _CsvRecordSplitter()
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if line is None:
+            # The oversized line also ends any CSV record it was part of
+            for start, record in splitter.finish():
+                yield start, _checked(record)
+            yield (
+                line_number,
+                ValueError(f"Line exceeds {MAX_IMPORT_RECORD_SIZE} characters"),
+            )
+        elif format != WorkItemFileFormat.CSV:
+            yield line_number, line
+        else:
+            for start, record in splitter.feed(line_number, line):
+                yield start, _checked(record)
+
+    for start, record in splitter.finish():
+        yield start, _checked(record)
+
+
+def _checked(record: str | None) -> str | ValueError:
+    return ValueError("Unterminated quoted field") if record is None else record
+
+
+def _parse_csv_record(record: str | ValueError) -> list[str]:
+    if isinstance(record, ValueError):
+        raise record
+    return next(csv.reader(io.StringIO(record)))
+
+
+def _describe_error(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            ".".join(str(part) for part in detail["loc"]) + ": " + detail["msg"]
+            if detail["loc"]
+            else detail["msg"]
+            for detail in error.errors()
+        )
+    return str(error)
+
+
+class AutoCleanProgress:
+    """Where an auto-clean pass stopped, so a later scheduler run can resume it."""
+
+    def __init__(self) -> None:
+        # Workqueue ids still to clean in the current pass; None between passes
+        self.remaining: list[int] | None = None
+        # Resume point and running total for the workqueue at the head of the list
+        self.after_id = 0
+        self.deleted = 0
+
+    @property
+    def in_progress(self) -> bool:
+        return self.remaining is not None
+
+    def next_workqueue(self) -> None:
+        self.remaining.pop(0)
+        self.after_id = 0
+        self.deleted = 0
+
 
 class WorkqueueService:
-    def __init__(self, workqueue_repository: WorkqueueRepository):
+    def __init__(
+        self,
+        workqueue_repository: WorkqueueRepository,
+        work_item_repository: WorkItemRepository | None = None,
+    ):
         self.repository = workqueue_repository
+        self.work_item_repository = work_item_repository
 
     async def search_workitems(
         self,
@@ -19,40 +194,265 @@ class WorkqueueService:
         page: int = 1,
         size: int = 10,
         search: Optional[str] = None,
+        after: Optional[str] = None,
+        total: TotalCount = TotalCount.EXACT,
+        fulltext: Optional[str] = None,
+        data_contains: Optional[str] = None,
     ) -> PaginatedResponse[WorkItem]:
+        """Search a queue's items by page number, or by keyset when `after` is set.
+
+        Raises:
+            ValueError: If `after` is not a cursor issued by this endpoint, or
+                `data_contains` is not a JSON object.
+        """
         skip = (page - 1) * size
-        sessions, total_items = await self.repository.get_workitems_paginated(
-            workqueue_id, search, skip, size
+        cursor = KeysetCursor.decode(after) if after else None
+        data_filter = None
+        if data_contains:
+            try:
+                data_filter = json.loads(data_contains)
+            except ValueError:
+                raise ValueError("data_contains must be a JSON object")
+            if not isinstance(data_filter, dict):
+                raise ValueError("data_contains must be a JSON object")
+        items, total_items = await self.repository.get_workitems_paginated(
+            workqueue_id,
+            search,
+            skip,
+            size,
+            after=(cursor.updated_at, cursor.id) if cursor else None,
+            total=total,
+            fulltext=fulltext,
+            data_contains=data_filter,
         )
 
-        total_pages = (total_items + size - 1) // size
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + size - 1) // size
+
+        next_cursor = None
+        if len(items) == size:
+            last = items[-1]
+            next_cursor = KeysetCursor(updated_at=last.updated_at, id=last.id).encode()
 
         response = PaginatedResponse[WorkItem](
             page=page,
             size=size,
             total_items=total_items,
             total_pages=total_pages,
-            items=sessions,
+            total_estimated=total == TotalCount.ESTIMATED,
+            items=items,
+            next_cursor=next_cursor,
         )
 
         return response
 
-    async def count_pending_items(self, workqueue_id: int) -> int:
-        # TODO: Implement deferred on this method
-        return await self.repository.get_workitem_count(
-            workqueue_id, status=WorkItemStatus.NEW
+    async def export_workitems(
+        self,
+        workqueue_id: int,
+        format: WorkItemFileFormat = WorkItemFileFormat.NDJSON,
+        status: WorkItemStatus | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield a queue's items as NDJSON lines or CSV rows, in chunks.
+
+        Rows are written as they come off the database cursor. In CSV the
+        `data` column holds the item's data as JSON.
+        """
+        columns = list(WorkItemRead.model_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == WorkItemFileFormat.CSV:
+            writer.writerow(columns)
+
+        rows = 0
+        items = self.repository.stream_workitems(
+            workqueue_id, status, created_after, created_before, EXPORT_BATCH_SIZE
         )
+        async for item in items:
+            row = WorkItemRead.model_validate(item, from_attributes=True)
+            if format == WorkItemFileFormat.CSV:
+                values = row.model_dump(mode="json")
+                values["data"] = json.dumps(values["data"])
+                writer.writerow(values[column] for column in columns)
+            else:
+                buffer.write(row.model_dump_json())
+                buffer.write("\n")
+
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    async def import_workitems(
+        self,
+        workqueue_id: int,
+        chunks: AsyncIterator[bytes],
+        format: WorkItemFileFormat = WorkItemFileFormat.NDJSON,
+    ) -> WorkItemImportResult:
+        """Add NEW work items from an NDJSON or CSV byte stream.
+
+        NDJSON lines are `WorkItemCreate` objects. CSV starts with a header
+        naming a `reference` and/or `data` (JSON) column, optionally `priority`
+        and `not_before`; other columns, such as those of an export, are
+        ignored. Quoted CSV fields may span up to MAX_IMPORT_RECORD_LINES lines.
+        Valid records are inserted and committed every IMPORT_BATCH_SIZE
+        records; invalid ones are skipped and reported with the line they start
+        on.
+
+        Raises:
+            ValueError: If the stream is not UTF-8 or the CSV header lacks both
+                columns. Batches committed before that are kept.
+        """
+        result = WorkItemImportResult()
+        batch: list[dict] = []
+        header: list[str] | None = None
+
+        async def flush() -> None:
+            ids = await self.work_item_repository.create_many(workqueue_id, batch)
+            result.imported += len(ids)
+            batch.clear()
+
+        async for line_number, line in _iter_records(chunks, format):
+            if isinstance(line, str) and not line.strip():
+                continue
+
+            if format == WorkItemFileFormat.CSV and header is None:
+                header = _parse_csv_record(line)
+                if not {"reference", "data"} & set(header):
+                    raise ValueError("CSV header needs a reference or data column")
+                continue
+
+            try:
+                if format == WorkItemFileFormat.CSV:
+                    values = _parse_csv_record(line)
+                    if len(values) != len(header):
+                        raise ValueError(
+                            f"Expected {len(header)} columns, got {len(values)}"
+                        )
+                    record = dict(zip(header, values))
+                    item = {
+                        key: record[key]
+                        for key in ("reference", "data", "priority", "not_before")
+                        if key in record
+                    }
+                    item["data"] = json.loads(item.get("data") or "{}")
+                    for key in ("priority", "not_before"):
+                        if item.get(key) == "":
+                            del item[key]
+                elif isinstance(line, ValueError):
+                    raise line
+                else:
+                    item = json.loads(line)
+
+                batch.append(WorkItemCreate.model_validate(item).model_dump())
+            except ValueError as e:
+                result.failed += 1
+                if len(result.errors) < MAX_IMPORT_ERRORS:
+                    result.errors.append(
+                        WorkItemImportError(line=line_number, error=_describe_error(e))
+                    )
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
 
-    async def auto_clean_workqueues(self) -> None:
-        """Delete old completed/failed workitems from workqueues with auto-clean enabled."""
-        workqueues = await self.repository.get_auto_clean_workqueues()
-        for workqueue in workqueues:
-            deleted_count = await self.repository.clear_terminal_items_older_than(
-                workqueue.id, workqueue.auto_clean_max_age_days
+        if batch:
+            await flush()
+
+        return result
+
+    async def count_pending_items(self, workqueue_id: int) -> int:
+        """Count the NEW items that can be dequeued now, leaving out delayed ones."""
+        counts = await self.repository.get_pending_workitem_counts([workqueue_id])
+        return counts[workqueue_id]
+
+    async def requeue_expired_leases(self) -> None:
+        """Return items whose worker stopped renewing its lease to the queue."""
+        requeued = await self.repository.requeue_expired_leases()
+        for workqueue_id, count in requeued.items():
+            logger.warning(
+                f"Requeued {count} workitems with expired leases in "
+                f"workqueue id={workqueue_id}"
             )
-            if deleted_count > 0:
-                logger.info(
-                    f"Auto-clean deleted {deleted_count} workitems from "
-                    f"workqueue '{workqueue.name}' (id={workqueue.id}) older than "
-                    f"{workqueue.auto_clean_max_age_days} days"
-                )
+
+    async def retry_failed_items(self) -> None:
+        """Give failed items another attempt where their workqueue allows it."""
+        retried = await self.repository.retry_failed_items()
+        for workqueue_id, count in retried.items():
+            logger.info(
+                f"Scheduled retry of {count} failed workitems in "
+                f"workqueue id={workqueue_id}"
+            )
+
+    async def release_delayed_items(self) -> None:
+        """Wake up waiters on queues whose delayed items have become due."""
+        await self.repository.release_delayed_items()
+
+    async def auto_clean_workqueues(
+        self,
+        progress: AutoCleanProgress | None = None,
+        time_budget: float | None = None,
+        batch_size: int = settings.auto_clean_batch_size,
+    ) -> bool:
+        """Delete old completed/failed workitems from workqueues with auto-clean enabled.
+
+        Items are deleted in committed batches of `batch_size`. When
+        `time_budget` seconds have passed the pass stops between batches and
+        records its position in `progress`; calling again with the same
+        `progress` resumes it. Returns True once the pass has finished.
+        """
+        progress = progress or AutoCleanProgress()
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+
+        if not progress.in_progress:
+            workqueues = await self.repository.get_auto_clean_workqueues()
+            progress.remaining = [workqueue.id for workqueue in workqueues]
+
+        while progress.remaining:
+            # Re-read the queue: its setting may have changed since the pass began
+            workqueue = await self.repository.get(progress.remaining[0])
+            if (
+                workqueue is None
+                or workqueue.deleted
+                or workqueue.auto_clean_max_age_days is None
+            ):
+                progress.next_workqueue()
+                continue
+
+            deleted, after_id = await self.repository.clear_terminal_items_batch(
+                workqueue.id,
+                workqueue.auto_clean_max_age_days,
+                progress.after_id,
+                batch_size,
+            )
+            progress.deleted += deleted
+
+            if after_id is None:
+                if progress.deleted > 0:
+                    logger.info(
+                        f"Auto-clean deleted {progress.deleted} workitems from "
+                        f"workqueue '{workqueue.name}' (id={workqueue.id}) older "
+                        f"than {workqueue.auto_clean_max_age_days} days"
+                    )
+                progress.next_workqueue()
+            else:
+                progress.after_id = after_id
+
+            if deadline is not None and time.monotonic() >= deadline:
+                if progress.remaining:
+                    logger.info(
+                        f"Auto-clean paused after deleting {progress.deleted} "
+                        f"workitems from workqueue id={progress.remaining[0]}; "
+                        f"{len(progress.remaining)} workqueue(s) left, resuming "
+                        f"next run"
+                    )
+                    return False
+                break
+
+        progress.remaining = None
+        return True
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure next_item dequeue throughput with parallel workers on one workqueue.
+
+Fills a dedicated workqueue with NEW items directly in SQL (generate_series),
+then lets each worker claim items one at a time with
+WorkItemRepository.get_next_item, on its own connection, until the queue is
+empty. Every claim updates the queue's workqueueitemcount rows in the same
+transaction, so this shows whether concurrent claims wait on each other for
+those rows. `--hold-ms` keeps each claim's transaction open that much longer
+before committing, standing in for the network round trip and commit latency
+of a remote database that a local run lacks.
+
+Talks to the database directly (DATABASE_URL), not the API. The benchmark
+workqueue and its items are deleted afterwards.
+
+Usage:
+    uv run python benchmarks/dequeue_concurrency.py [--workers 1,4,16]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import WorkItem, Workqueue
+from app.database.repository import WorkItemRepository
+from app.database.session import async_engine
+
+from dequeue_latency import fill
+
+WORKQUEUE_NAME = "dequeue-concurrency-benchmark"
+
+
+async def worker(workqueue_id: int, hold_ms: int) -> int:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        if hold_ms:
+
+            @event.listens_for(session.sync_session, "before_commit")
+            def hold(sync_session):
+                sync_session.execute(text(f"SELECT pg_sleep({hold_ms / 1000})"))
+
+        repository = WorkItemRepository(session)
+        claimed = 0
+        while await repository.get_next_item(workqueue_id):
+            claimed += 1
+        return claimed
+
+
+async def main(workers: list[int], items: int, hold_ms: int) -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        workqueue = Workqueue(name=WORKQUEUE_NAME, description="benchmark")
+        session.add(workqueue)
+        await session.commit()
+
+        try:
+            print(f"{'workers':>8} {'claims/s':>10}")
+            for count in workers:
+                await fill(session, workqueue.id, items)
+
+                start = time.perf_counter()
+                claimed = await asyncio.gather(
+                    *(worker(workqueue.id, hold_ms) for _ in range(count))
+                )
+                elapsed = time.perf_counter() - start
+                print(f"{count:>8} {sum(claimed) / elapsed:>10.0f}")
+        finally:
+            await session.execute(
+                delete(WorkItem).where(WorkItem.workqueue_id == workqueue.id)
+            )
+            await session.delete(workqueue)
+            await session.commit()
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,4,16")
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--hold-ms", type=int, default=20)
+    args = parser.parse_args()
+    workers = [int(w) for w in args.workers.split(",")]
+    asyncio.run(main(workers, args.items, args.hold_ms))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure next_item dequeue latency as a workqueue grows.
+
+Fills a dedicated workqueue with NEW items directly in SQL (generate_series),
+then times WorkItemRepository.get_next_item — the exact query behind
+GET /workqueues/{id}/next_item — at each queue size. With the partial index
+ix_workitem_dequeue_ready the latency should stay flat; without it every
+dequeue sorts all NEW rows of the queue.
+
+Talks to the database directly (DATABASE_URL), not the API. The benchmark
+workqueue and its items are deleted afterwards.
+
+Usage:
+    uv run python benchmarks/dequeue_latency.py [--sizes 10000,100000,1000000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import WorkItem, Workqueue
+from app.database.repository import WorkItemRepository
+from app.database.session import async_engine
+
+WORKQUEUE_NAME = "dequeue-latency-benchmark"
+
+FILL_SQL = text(
+    """
+    INSERT INTO workitem
+        (data, reference, locked, status, message, workqueue_id,
+         created_at, updated_at)
+    SELECT '{}'::jsonb, 'bench-' || g, false, 'NEW', '', :workqueue_id,
+           now() - make_interval(secs => g), now()
+    FROM generate_series(1, :count) AS g
+    """
+)
+
+
+async def fill(session: AsyncSession, workqueue_id: int, count: int) -> None:
+    await session.execute(FILL_SQL, {"workqueue_id": workqueue_id, "count": count})
+    await session.commit()
+    await session.execute(text("ANALYZE workitem"))
+    await session.commit()
+
+
+async def time_dequeues(session: AsyncSession, workqueue_id: int, samples: int):
+    repository = WorkItemRepository(session)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await repository.get_next_item(workqueue_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main(sizes: list[int], samples: int) -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        workqueue = Workqueue(name=WORKQUEUE_NAME, description="benchmark")
+        session.add(workqueue)
+        await session.commit()
+
+        try:
+            print(f"{'queue size':>12} {'median ms':>10} {'p95 ms':>10}")
+            queued = 0
+            for size in sizes:
+                await fill(session, workqueue.id, size - queued)
+                queued = size
+
+                timings = await time_dequeues(session, workqueue.id, samples)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(f"{size:>12,} {statistics.median(timings):>10.2f} {p95:>10.2f}")
+                # Claimed items leave the queue; top it back up next round
+                queued -= samples
+        finally:
+            await session.execute(
+                delete(WorkItem).where(WorkItem.workqueue_id == workqueue.id)
+            )
+            await session.delete(workqueue)
+            await session.commit()
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main([int(s) for s in args.sizes.split(",")], args.samples))
@@ -10,8 +10,10 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from alembic import command
 from app.config import settings
+from app.database.count_cache import count_cache
 from app.database.session import get_session
 from app.main import app
+from app.security import access_token_cache
 
 
 @pytest.fixture(scope="session")
@@ -116,6 +118,8 @@ async def client_fixture(session: AsyncSession):
         yield session
 
     app.dependency_overrides[get_session] = get_session_override
+    access_token_cache.clear()
+    count_cache.clear()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
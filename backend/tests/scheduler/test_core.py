@@ -92,62 +92,37 @@ class TestAutomationScheduler:
     async def test_process_triggers_empty_list(self):
         """Test processing triggers with empty trigger list."""
         mock_trigger_repo = AsyncMock()
-        mock_process_repo = AsyncMock()
-        mock_trigger_repo.get_all.return_value = []
+        mock_trigger_repo.get_enabled_with_process.return_value = []
+        self.scheduler.processor_registry = MagicMock()
 
         # Should complete without errors
-        await self.scheduler._process_triggers(
-            mock_trigger_repo, mock_process_repo, datetime.now()
-        )
+        await self.scheduler._process_triggers(mock_trigger_repo, datetime.now())
 
-        mock_trigger_repo.get_all.assert_called_once_with(include_deleted=False)
+        mock_trigger_repo.get_enabled_with_process.assert_called_once_with()
+        self.scheduler.processor_registry.get_processor.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_process_triggers_skips_disabled_triggers(self):
-        """Test that disabled triggers are skipped."""
+    @patch("app.scheduler.core.TriggerContext.load", new_callable=AsyncMock)
+    async def test_process_triggers_loads_context_once(self, mock_load):
+        """The tick's context is loaded once and shared by all triggers."""
         mock_trigger_repo = AsyncMock()
-        mock_process_repo = AsyncMock()
+        triggers = [MagicMock(id=1), MagicMock(id=2)]
+        mock_trigger_repo.get_enabled_with_process.return_value = triggers
 
-        # Create disabled trigger
-        disabled_trigger = MagicMock()
-        disabled_trigger.enabled = False
-        disabled_trigger.id = 1
+        registry = MagicMock()
+        processor = registry.get_processor.return_value
+        processor.process = AsyncMock(return_value=True)
+        self.scheduler.processor_registry = registry
 
-        mock_trigger_repo.get_all.return_value = [disabled_trigger]
+        now = datetime.now()
+        await self.scheduler._process_triggers(mock_trigger_repo, now)
 
-        await self.scheduler._process_triggers(
-            mock_trigger_repo, mock_process_repo, datetime.now()
+        mock_load.assert_called_once_with(registry.services, triggers)
+        assert registry.services.context == mock_load.return_value
+        processor.process.assert_has_calls(
+            [call(triggers[0], now), call(triggers[1], now)]
         )
 
-        # Should not process disabled triggers
-        mock_process_repo.get.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_process_triggers_skips_deleted_processes(self):
-        """Test that triggers for deleted processes are skipped."""
-        mock_trigger_repo = AsyncMock()
-        mock_process_repo = AsyncMock()
-
-        # Create enabled trigger
-        enabled_trigger = MagicMock()
-        enabled_trigger.enabled = True
-        enabled_trigger.process_id = 1
-        enabled_trigger.id = 2
-
-        # Process is deleted
-        deleted_process = MagicMock()
-        deleted_process.deleted = True
-
-        mock_trigger_repo.get_all.return_value = [enabled_trigger]
-        mock_process_repo.get.return_value = deleted_process
-
-        await self.scheduler._process_triggers(
-            mock_trigger_repo, mock_process_repo, datetime.now()
-        )
-
-        # Should check process status but not proceed with processing
-        mock_process_repo.get.assert_called_once_with(1)
-
 
 @pytest.mark.asyncio
 async def test_scheduler_background_task():
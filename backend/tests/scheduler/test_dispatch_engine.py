@@ -0,0 +1,143 @@
+"""
+Tests for scheduler dispatch_engine module.
+"""
+
+from unittest.mock import MagicMock
+
+from app.scheduler.dispatch_engine import DispatchEngine
+
+
+def create_mock_resource(capabilities):
+    """Helper to create mock resource."""
+    resource = MagicMock()
+    resource.capabilities = capabilities
+    return resource
+
+
+def create_mock_session(requirements):
+    """Helper to create mock session with a process."""
+    session = MagicMock()
+    session.process.requirements = requirements
+    return session
+
+
+class TestDispatchEngine:
+    """Tests for DispatchEngine class."""
+
+    def test_take_prefers_fewest_capabilities(self):
+        """The least specialized matching resource is taken first."""
+        resource1 = create_mock_resource("python docker linux")
+        resource2 = create_mock_resource("python")
+        engine = DispatchEngine([resource1, resource2])
+
+        assert engine.take("python") == resource2
+        assert engine.take("python") == resource1
+        assert engine.take("python") is None
+        assert engine.free_resources == 0
+
+    def test_take_keeps_order_on_ties(self):
+        """Resources with equally many capabilities are taken in given order."""
+        resource1 = create_mock_resource("python docker")
+        resource2 = create_mock_resource("python java")
+        engine = DispatchEngine([resource1, resource2])
+
+        assert engine.take("") == resource1
+
+    def test_take_no_match(self):
+        """A resource is only taken when it satisfies all requirements."""
+        resource = create_mock_resource("python")
+        engine = DispatchEngine([resource])
+
+        assert engine.take("python docker") is None
+        assert engine.take("python docker") is None
+        assert engine.free_resources == 1
+
+    def test_assign_fifo(self):
+        """Sessions are matched in order; later ones may still fit elsewhere."""
+        windows = create_mock_resource("win32 chrome")
+        linux = create_mock_resource("linux")
+        session1 = create_mock_session("win32")
+        session2 = create_mock_session("win32")
+        session3 = create_mock_session("linux")
+        engine = DispatchEngine([windows, linux])
+
+        assignments = engine.assign([session1, session2, session3])
+        assert assignments == [(session1, windows), (session3, linux)]
+
+    def test_assign_session_without_process(self):
+        """Sessions without a process have no requirements."""
+        resource = create_mock_resource("python")
+        session = MagicMock()
+        session.process = None
+        engine = DispatchEngine([resource])
+
+        assert engine.assign([session]) == [(session, resource)]
+
+    def test_assign_no_resources(self):
+        """Nothing is assigned from an empty pool."""
+        engine = DispatchEngine([])
+        assert engine.assign([create_mock_session("")]) == []
+
+
+class TestDispatchEngineMatching:
+    """Tests for DispatchEngine.assign_matching."""
+
+    def test_generic_session_leaves_specialised_resource(self):
+        """A generic session is moved off the only resource a later one needs."""
+        sap = create_mock_resource("win32 sap")
+        session1 = create_mock_session("win32")
+        session2 = create_mock_session("sap")
+        windows = create_mock_resource("win32 chrome playwright")
+
+        # Greedy gives the SAP machine to the first session and starves the second
+        engine = DispatchEngine([sap, windows])
+        assert engine.assign([session1, session2]) == [(session1, sap)]
+
+        engine = DispatchEngine([sap, windows])
+        assignments = engine.assign_matching([session1, session2])
+        assert assignments == [(session1, windows), (session2, sap)]
+        assert engine.free_resources == 0
+
+    def test_prefers_older_sessions(self):
+        """When not everyone fits, the older session keeps its resource."""
+        resource = create_mock_resource("python")
+        session1 = create_mock_session("python")
+        session2 = create_mock_session("python")
+        engine = DispatchEngine([resource])
+
+        assert engine.assign_matching([session1, session2]) == [(session1, resource)]
+
+    def test_matches_greedy_without_contention(self):
+        """Without contention each session gets its best-fit resource."""
+        resource1 = create_mock_resource("python docker linux")
+        resource2 = create_mock_resource("python")
+        resource3 = create_mock_resource("java")
+        session1 = create_mock_session("python")
+        session2 = create_mock_session("java")
+        session3 = create_mock_session("go")
+
+        engine = DispatchEngine([resource1, resource2, resource3])
+        assignments = engine.assign_matching([session1, session2, session3])
+        assert assignments == [(session1, resource2), (session2, resource3)]
+        assert engine.free_resources == 1
+
+    def test_chain_of_moves(self):
+        """Several matched sessions shift along to make room."""
+        a = create_mock_resource("a")
+        ab = create_mock_resource("a b")
+        other = create_mock_resource("x y z")
+        sessions = [
+            create_mock_session(""),
+            create_mock_session("a"),
+            create_mock_session("a b"),
+        ]
+
+        engine = DispatchEngine([a, ab, other])
+        assert len(engine.assign(sessions)) == 2
+
+        engine = DispatchEngine([a, ab, other])
+        assert engine.assign_matching(sessions) == [
+            (sessions[0], other),
+            (sessions[1], a),
+            (sessions[2], ab),
+        ]
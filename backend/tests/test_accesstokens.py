@@ -142,3 +142,36 @@ async def test_delete_last_accesstoken_is_blocked(
     )
     assert response.status_code == 200
     assert len(response.json()) == 1
+
+
+async def test_deleted_accesstoken_is_rejected(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    first = (
+        await client.post("/accesstokens", json={"identifier": "FirstToken"})
+    ).json()["access_token"]
+    second = (
+        await client.post(
+            "/accesstokens",
+            headers={"Authorization": f"Bearer {first}"},
+            json={"identifier": "SecondToken"},
+        )
+    ).json()["access_token"]
+
+    # Warm the token cache before deleting
+    response = await client.get(
+        "/accesstokens/", headers={"Authorization": f"Bearer {first}"}
+    )
+    assert response.status_code == 200
+
+    response = await client.delete(
+        "/accesstokens/1", headers={"Authorization": f"Bearer {second}"}
+    )
+    assert response.status_code == 204
+
+    response = await client.get(
+        "/accesstokens/", headers={"Authorization": f"Bearer {first}"}
+    )
+    assert response.status_code == 401
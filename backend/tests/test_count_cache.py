@@ -0,0 +1,27 @@
+from app.database.count_cache import CountCache
+
+
+def test_cached_count_is_returned():
+    cache = CountCache(ttl_seconds=60)
+    cache.put(("query", ()), 42)
+
+    assert cache.get(("query", ())) == 42
+    assert cache.get(("other", ())) is None
+
+
+def test_entries_expire_with_ttl():
+    cache = CountCache(ttl_seconds=0)
+    cache.put("key", 42)
+
+    assert cache.get("key") is None
+
+
+def test_oldest_entries_are_evicted():
+    cache = CountCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
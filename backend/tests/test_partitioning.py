@@ -0,0 +1,92 @@
+from datetime import date, datetime
+
+from alembic.config import Config
+from httpx import AsyncClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from alembic import command
+from app.config import settings
+from app.database.models import AuditLog
+from app.database.partitioning import (
+    add_months,
+    drop_expired_partitions,
+    ensure_partitions,
+    get_partitions,
+    is_partitioned,
+    maintain_partitions,
+    partition_table,
+)
+
+from . import generate_basic_data  # noqa: F401
+
+
+def test_add_months_rolls_over_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+async def test_maintenance_skips_unpartitioned_tables(session: AsyncSession):
+    assert not await is_partitioned(session, "auditlog")
+    assert await ensure_partitions(session, "auditlog", 3) == []
+    assert await drop_expired_partitions(session, "auditlog", 1) == []
+
+
+async def test_maintenance_reports_unconverted_table(
+    session: AsyncSession, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "auditlog_partitioning", True)
+    await maintain_partitions(session)
+    assert "python -m app.database.partitioning auditlog" in caplog.text
+
+
+async def test_partitioned_auditlog(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+    rows = await session.scalar(select(func.count()).select_from(AuditLog))
+    await session.commit()
+
+    engine = create_engine(settings.database_url)
+    assert partition_table(engine, "auditlog", settings.partition_premake_months)
+    assert not partition_table(engine, "auditlog", 1)
+    engine.dispose()
+
+    assert await is_partitioned(session, "auditlog")
+    assert await session.scalar(select(func.count()).select_from(AuditLog)) == rows
+    names = [name for name, _ in await get_partitions(session, "auditlog")]
+    assert "auditlog_legacy" in names
+    assert "auditlog_default" in names
+    await session.commit()
+
+    response = await client.post(
+        "/audit-logs",
+        json={
+            "message": "after partitioning",
+            "session_id": 1,
+            "event_timestamp": datetime.now().isoformat(),
+        },
+    )
+    assert response.status_code == 204
+
+    # Creating partitions is idempotent and continues after the last one
+    today = date.today()
+    created = await ensure_partitions(session, "auditlog", 6, today)
+    assert created == [
+        f"auditlog_p{add_months(today, months):%Y%m}"
+        for months in range(settings.partition_premake_months + 2, 7)
+    ]
+    assert await ensure_partitions(session, "auditlog", 6, today) == []
+
+    # Once everything in it has expired, the legacy partition goes as a whole
+    dropped = await drop_expired_partitions(
+        session, "auditlog", 1, add_months(today, 3)
+    )
+    assert dropped == ["auditlog_legacy"]
+    assert await session.scalar(select(func.count()).select_from(AuditLog)) == 0
+
+    await session.commit()
+
+    # Downgrading collapses it back into a regular table
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", settings.database_url)
+    command.downgrade(alembic_cfg, "d5a7e3c9b184")
+    assert not await is_partitioned(session, "auditlog")
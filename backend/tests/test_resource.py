@@ -1,6 +1,10 @@
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import app.database.models as models
+import app.enums as enums
+from app.database.repository import ResourceRepository
+
 from . import generate_basic_data  # noqa: F401
 
 
@@ -140,3 +144,58 @@ async def test_update_old_resource(session: AsyncSession, client: AsyncClient):
     assert data["capabilities"] == "win32 chrome python blue_prism"
     assert data["available"] is True
     assert data["last_seen"] is not None
+
+
+async def test_get_available_resources(session: AsyncSession):
+    await generate_basic_data(session)
+    repository = ResourceRepository(session)
+
+    # Resource 2 is deleted and resource 3 has a NEW session dispatched to it
+    available = await repository.get_available_resources()
+    assert [resource.id for resource in available] == [1, 4]
+    assert await repository.is_resource_available(await repository.get(1))
+    assert not await repository.is_resource_available(await repository.get(3))
+
+    session.add(
+        models.Session(
+            process_id=1, status=enums.SessionStatus.IN_PROGRESS, resource_id=1
+        )
+    )
+    session.add(
+        models.Session(
+            process_id=1, status=enums.SessionStatus.COMPLETED, resource_id=4
+        )
+    )
+    await session.commit()
+
+    available = await repository.get_available_resources()
+    assert [resource.id for resource in available] == [4]
+
+
+async def test_get_available_resources_with_requirements(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+    repository = ResourceRepository(session)
+
+    response = await client.post(
+        "/resources",
+        json={
+            "name": "sap",
+            "fqdn": "sap.example.com",
+            "capabilities": " win32, sap  playwright",
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(data["capability_set"]) == ["playwright", "sap", "win32"]
+
+    available = await repository.get_available_resources({"win32", "python"})
+    assert [resource.id for resource in available] == [1, 4]
+    available = await repository.get_available_resources({"sap", ""})
+    assert [resource.id for resource in available] == [data["id"]]
+    available = await repository.get_available_resources()
+    assert [resource.id for resource in available] == [1, 4, data["id"]]
+
+    assert await repository.has_available_resource({"playwright"})
+    assert not await repository.has_available_resource({"sap", "linux"})
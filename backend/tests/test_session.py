@@ -1,7 +1,11 @@
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import app.database.models as models
 import app.enums as enums
+from app.database.repository import ResourceRepository, SessionRepository
+from app.scheduler.dispatcher import ResourceDispatcher
+from app.services import ResourceService
 
 from . import generate_basic_data  # noqa: F401
 
@@ -171,3 +175,68 @@ async def test_get_paginated_sessions_with_search(
 
     data = response.json()
     assert data["total_items"] == 3
+
+
+async def test_get_paginated_sessions_without_total(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.get("/sessions/?page=1&size=2&total=none")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["total_items"] is None
+    assert data["total_pages"] is None
+    assert len(data["items"]) == 2
+
+
+async def test_get_paginated_sessions_estimated_total(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.get("/sessions/?total=estimated")
+    data = response.json()
+    assert data["total_items"] == 3
+    assert data["total_estimated"] is True
+
+    response = await client.post("/sessions/", json={"process_id": 1})
+    assert response.status_code == 200
+
+    # The estimate is reused until it ages out; an exact count sees the new row
+    response = await client.get("/sessions/?total=estimated")
+    assert response.json()["total_items"] == 3
+
+    response = await client.get("/sessions/")
+    assert response.json()["total_items"] == 4
+
+
+async def test_dispatch_pending_sessions(session: AsyncSession):
+    await generate_basic_data(session)
+    session_repository = SessionRepository(session)
+    resource_repository = ResourceRepository(session)
+    dispatcher = ResourceDispatcher(
+        ResourceService(resource_repository, session_repository), session_repository
+    )
+
+    session.add(models.Session(process_id=1, status=enums.SessionStatus.NEW))
+    session.add(models.Session(process_id=1, status=enums.SessionStatus.NEW))
+    await session.commit()
+
+    await dispatcher.dispatch_all_pending()
+
+    # Resource 3 expires and its session is pending again; resources 1 and 4
+    # go to the two oldest pending sessions
+    dispatched = {
+        s.id: s.resource_id
+        for s in await session_repository.get_new_sessions()
+        if not s.deleted
+    }
+    assert dispatched == {1: 1, 4: 4, 5: None, 6: None}
+    assert await resource_repository.get_available_resources() == []
+
+    # Sessions that were dispatched meanwhile are skipped with their resource
+    resource = await resource_repository.get(1)
+    pending = await session_repository.get(1)
+    assert await session_repository.assign_resources([(pending, resource)]) == []
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from app.database.models import AccessToken
+from app.security import AccessTokenCache
+
+
+def _token(expires_at: datetime) -> AccessToken:
+    return AccessToken(
+        id=1, identifier="robot", access_token="secret", expires_at=expires_at
+    )
+
+
+def test_cached_token_is_returned():
+    cache = AccessTokenCache(ttl_seconds=60)
+    cache.put(_token(datetime.now() + timedelta(days=1)))
+
+    assert cache.get("secret").identifier == "robot"
+    assert cache.get("unknown") is None
+
+
+def test_entries_expire_with_ttl():
+    cache = AccessTokenCache(ttl_seconds=0)
+    cache.put(_token(datetime.now() + timedelta(days=1)))
+    cache.set_auth_enforced(True)
+
+    assert cache.get("secret") is None
+    assert cache.get_auth_enforced() is None
+
+
+def test_expired_token_is_not_returned():
+    cache = AccessTokenCache(ttl_seconds=60)
+    cache.put(_token(datetime.now() - timedelta(seconds=1)))
+
+    assert cache.get("secret") is None
+
+
+def test_clear_drops_tokens_and_auth_state():
+    cache = AccessTokenCache(ttl_seconds=60)
+    cache.put(_token(datetime.now() + timedelta(days=1)))
+    cache.set_auth_enforced(True)
+
+    cache.clear()
+
+    assert cache.get("secret") is None
+    assert cache.get_auth_enforced() is None
@@ -1,7 +1,17 @@
+from datetime import datetime, timedelta
+
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import app.database.models as models
 import app.enums as enums
+from app.database.repository import (
+    ResourceRepository,
+    SessionRepository,
+    TriggerRepository,
+    WorkqueueRepository,
+)
+from app.scheduler.trigger_processors import ProcessingServices, TriggerContext
 
 from . import generate_basic_data  # noqa: F401
 
@@ -118,3 +128,100 @@ async def test_update_trigger(session: AsyncSession, client: AsyncClient):
     assert data["type"] == enums.TriggerType.WORKQUEUE
     assert data["workqueue_id"] == 1
     assert data["cron"] == ""
+
+
+async def test_get_enabled_with_process(session: AsyncSession):
+    await generate_basic_data(session)
+    repository = TriggerRepository(session)
+
+    # Disabled, and on the deleted process 2
+    session.add(
+        models.Trigger(
+            type=enums.TriggerType.CRON, cron="* * * * *", enabled=False, process_id=1
+        )
+    )
+    session.add(
+        models.Trigger(
+            type=enums.TriggerType.CRON, cron="* * * * *", enabled=True, process_id=2
+        )
+    )
+    await session.commit()
+
+    # Trigger 3 is deleted
+    triggers = await repository.get_enabled_with_process()
+    assert [trigger.id for trigger in triggers] == [1, 2, 4]
+    assert all(trigger.process.id == 1 for trigger in triggers)
+
+
+async def test_load_trigger_context(session: AsyncSession):
+    await generate_basic_data(session)
+    services = ProcessingServices(
+        session_service=None,
+        resource_service=None,
+        workqueue_service=None,
+        trigger_repository=TriggerRepository(session),
+        session_repository=SessionRepository(session),
+        resource_repository=ResourceRepository(session),
+        workqueue_repository=WorkqueueRepository(session),
+        process_repository=None,
+    )
+    triggers = await services.trigger_repository.get_enabled_with_process()
+
+    context = await TriggerContext.load(services, triggers)
+    assert list(context.workqueues) == [1]
+    assert context.count_pending_items(1) == (
+        await services.workqueue_repository.get_workitem_count(
+            1, enums.WorkItemStatus.NEW
+        )
+    )
+    active = len(context.get_active_sessions(1))
+    assert active > 0
+    assert context.get_active_sessions(2) == []
+
+    # Sessions created by earlier triggers of the tick count as active
+    context.add_session(models.Session(process_id=1))
+    assert len(context.get_active_sessions(1)) == active + 1
+
+    assert await context.are_resources_available("win32 python")
+    assert not await context.are_resources_available("sap")
+
+
+async def test_trigger_context_skips_delayed_items(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+    services = ProcessingServices(
+        session_service=None,
+        resource_service=None,
+        workqueue_service=None,
+        trigger_repository=TriggerRepository(session),
+        session_repository=SessionRepository(session),
+        resource_repository=ResourceRepository(session),
+        workqueue_repository=WorkqueueRepository(session),
+        process_repository=None,
+    )
+    response = await client.post(
+        "/workqueues", json={"name": "Delayed", "description": "", "enabled": True}
+    )
+    workqueue_id = response.json()["id"]
+    trigger = models.Trigger(
+        type=enums.TriggerType.WORKQUEUE, workqueue_id=workqueue_id, process_id=1
+    )
+
+    later = (datetime.now() + timedelta(hours=1)).isoformat()
+    for reference in ("first", "second"):
+        await client.post(
+            f"/workqueues/{workqueue_id}/add",
+            json={"reference": reference, "not_before": later},
+        )
+    context = await TriggerContext.load(services, [trigger])
+    assert context.count_pending_items(workqueue_id) == 0
+
+    # Due delayed items are dequeueable
+    earlier = (datetime.now() - timedelta(minutes=1)).isoformat()
+    await client.post(
+        f"/workqueues/{workqueue_id}/add",
+        json={"reference": "due", "not_before": earlier},
+    )
+    context = await TriggerContext.load(services, [trigger])
+    assert context.count_pending_items(workqueue_id) == 1
@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from httpx import AsyncClient
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import app.database.models as models
@@ -388,3 +389,121 @@ async def test_update_workitem_status_timezone_aware_handling(
     completed_data = response.json()
     assert completed_data["work_duration_seconds"] is not None
     assert completed_data["status"] == WorkItemStatus.COMPLETED
+
+
+async def test_heartbeat_extends_lease(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    workqueue = await session.get(models.Workqueue, 1)
+    workqueue.lease_seconds = 600
+    await session.commit()
+
+    response = await client.get("/workqueues/1/next_item")
+    item = response.json()
+    first_lease = datetime.fromisoformat(item["lease_until"])
+
+    response = await client.put(f"/workitems/{item['id']}/heartbeat")
+    assert response.status_code == 200
+    assert datetime.fromisoformat(response.json()["lease_until"]) > first_lease
+
+    # Finishing the item releases the lease
+    response = await client.put(
+        f"/workitems/{item['id']}/status", json={"status": "completed"}
+    )
+    assert response.json()["lease_until"] is None
+
+
+async def test_heartbeat_requires_in_progress(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    # Item 1 is NEW
+    response = await client.put("/workitems/1/heartbeat")
+    assert response.status_code == 409
+
+
+async def test_update_workitem_statuses(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    for item_id in (1, 2):
+        await client.put(
+            f"/workitems/{item_id}/status", json={"status": WorkItemStatus.IN_PROGRESS}
+        )
+    await session.execute(
+        update(models.WorkItem)
+        .where(models.WorkItem.id.in_([1, 2]))
+        .values(started_at=datetime.now() - timedelta(seconds=30))
+    )
+    await session.commit()
+
+    response = await client.put(
+        "/workitems/status",
+        json=[
+            {"id": 1, "status": WorkItemStatus.COMPLETED, "message": "Done"},
+            {"id": 2, "status": WorkItemStatus.NEW},
+            {"id": 3, "status": WorkItemStatus.IN_PROGRESS},
+        ],
+    )
+    assert response.status_code == 200
+
+    items = {item["id"]: item for item in response.json()}
+    assert items[1]["status"] == WorkItemStatus.COMPLETED
+    assert items[1]["message"] == "Done"
+    assert items[1]["locked"] is False
+    assert 29 <= items[1]["work_duration_seconds"] <= 32
+    assert items[2]["status"] == WorkItemStatus.NEW
+    assert items[2]["locked"] is False
+    assert items[2]["work_duration_seconds"] is None
+    assert items[3]["status"] == WorkItemStatus.IN_PROGRESS
+    assert items[3]["started_at"] is not None
+
+    # All or nothing: an unknown id fails the whole batch
+    response = await client.put(
+        "/workitems/status",
+        json=[
+            {"id": 2, "status": WorkItemStatus.FAILED},
+            {"id": 99999, "status": WorkItemStatus.FAILED},
+        ],
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Workitems not found: 99999"
+    response = await client.get("/workitems/2")
+    assert response.json()["status"] == WorkItemStatus.NEW
+
+    response = await client.put(
+        "/workitems/status",
+        json=[
+            {"id": 2, "status": WorkItemStatus.FAILED},
+            {"id": 2, "status": WorkItemStatus.COMPLETED},
+        ],
+    )
+    assert response.status_code == 400
+
+
+async def test_update_workitem_statuses_duration_matches_single(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    await session.execute(
+        update(models.WorkItem)
+        .where(models.WorkItem.id.in_([1, 2]))
+        .values(
+            status=WorkItemStatus.IN_PROGRESS,
+            started_at=datetime.now() - timedelta(seconds=2.6),
+        )
+    )
+    await session.commit()
+
+    response = await client.put(
+        "/workitems/1/status", json={"status": WorkItemStatus.COMPLETED}
+    )
+    single = response.json()["work_duration_seconds"]
+    response = await client.put(
+        "/workitems/status", json=[{"id": 2, "status": WorkItemStatus.COMPLETED}]
+    )
+    bulk = response.json()[0]["work_duration_seconds"]
+
+    # Both truncate to whole seconds
+    assert single == bulk == 2
@@ -1,13 +1,19 @@
+import asyncio
+import csv
+import io
+import json
 from datetime import datetime, timedelta
 
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, update
 
-from app.database.models import AuditLog, WorkItem, Workqueue
-from app.database.repository import WorkqueueRepository
+import app.database.workqueue_notifier as workqueue_notifier_module
+from app.database.models import AuditLog, WorkItem, Workqueue, WorkqueueItemCount
+from app.database.repository import WorkItemRepository, WorkqueueRepository
+from app.database.workqueue_notifier import WorkqueueNotifier
 from app.enums import WorkItemStatus
-from app.services import WorkqueueService
+from app.services import AutoCleanProgress, WorkqueueService, workqueue_service
 
 from . import generate_basic_data  # noqa: F401
 
@@ -46,6 +52,68 @@ async def test_get_workqueues_information(session: AsyncSession, client: AsyncCl
     assert deleted_queue["pending_user_action"] == 0
 
 
+async def test_workqueues_information_tracks_changes(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    async def counts() -> dict:
+        response = await client.get("/workqueues/information")
+        return response.json()[0]
+
+    await client.post("/workqueues/1/add_many", json=[{}, {}, {}])
+    assert (await counts())["new"] == 4
+
+    await client.get("/workqueues/1/next_items?count=2")
+    data = await counts()
+    assert data["new"] == 2
+    assert data["in_progress"] == 3
+
+    await client.put("/workitems/1/status", json={"status": "completed"})
+    data = await counts()
+    assert data["in_progress"] == 2
+    assert data["completed"] == 2
+
+    await client.post("/workqueues/1/clear", json={"workitem_status": "completed"})
+    data = await counts()
+    assert data["completed"] == 0
+    assert data["new"] == 2
+    assert data["failed"] == 1
+
+
+async def test_workqueue_counters_with_parallel_dequeuers(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+    await client.post("/workqueues/1/add_many", json=[{}] * 39)
+
+    async def dequeue() -> list[int]:
+        async with AsyncSession(session.bind, expire_on_commit=False) as worker:
+            claimed = []
+            for _ in range(5):
+                items = await WorkItemRepository(worker).get_next_items(1, 1)
+                claimed += [item.id for item in items]
+            return claimed
+
+    claimed = [
+        id for ids in await asyncio.gather(*(dequeue() for _ in range(8))) for id in ids
+    ]
+    assert len(claimed) == len(set(claimed)) == 40
+
+    counts = await WorkqueueRepository(session).get_all_workitem_counts()
+    assert counts[1][WorkItemStatus.NEW] == 0
+    assert counts[1][WorkItemStatus.IN_PROGRESS] == 41
+
+    # The claims were spread over several counter rows
+    slots = await session.scalars(
+        select(WorkqueueItemCount.slot).where(
+            WorkqueueItemCount.workqueue_id == 1,
+            WorkqueueItemCount.status == WorkItemStatus.IN_PROGRESS,
+        )
+    )
+    assert len(slots.all()) > 1
+
+
 async def test_get_workqueues(session: AsyncSession, client: AsyncClient):
     await generate_basic_data(session)
 
@@ -157,6 +225,76 @@ async def test_add_workitem(session: AsyncSession, client: AsyncClient):
     assert data.locked is False
 
 
+async def test_add_many_workitems(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    response = await client.post(
+        "/workqueues/1/add_many",
+        json=[
+            {"data": {"index": 0}, "reference": "first"},
+            {"data": {"index": 1}},
+            {"reference": "third"},
+        ],
+    )
+
+    assert response.status_code == 200
+
+    ids = response.json()
+    assert len(ids) == 3
+    assert ids == sorted(ids)
+
+    items = [await session.get(WorkItem, id) for id in ids]
+    assert [item.reference for item in items] == ["first", "", "third"]
+    assert items[1].data == {"index": 1}
+    assert all(item.status == WorkItemStatus.NEW for item in items)
+    assert all(item.locked is False for item in items)
+    assert all(item.workqueue_id == 1 for item in items)
+
+
+async def test_enqueue_workitem_is_idempotent(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    payload = {"data": {"case": 1}, "reference": "case-1", "idempotency_key": "k-1"}
+    response = await client.post("/workqueues/1/enqueue", json=payload)
+    assert response.status_code == 200
+    first = response.json()
+    assert first["created"] is True
+    assert first["item"]["status"] == WorkItemStatus.NEW
+    assert first["item"]["idempotency_key"] == "k-1"
+
+    response = await client.post(
+        "/workqueues/1/enqueue", json={**payload, "data": {"case": 2}}
+    )
+    assert response.status_code == 200
+    second = response.json()
+    assert second["created"] is False
+    assert second["item"]["id"] == first["item"]["id"]
+    assert second["item"]["data"] == {"case": 1}
+
+    # Keys are scoped to a workqueue
+    response = await client.post(
+        "/workqueues/", json={"name": "Other queue", "description": "", "enabled": True}
+    )
+    other_id = response.json()["id"]
+    response = await client.post(f"/workqueues/{other_id}/enqueue", json=payload)
+    assert response.json()["created"] is True
+
+    response = await client.post("/workqueues/1/enqueue", json={"reference": "no key"})
+    assert response.status_code == 422
+
+
+async def test_add_many_workitems_empty_batch(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.post("/workqueues/1/add_many", json=[])
+
+    assert response.status_code == 422
+
+
 async def test_next_item(session: AsyncSession, client: AsyncClient):
     await generate_basic_data(session)
 
@@ -182,6 +320,286 @@ async def test_next_item(session: AsyncSession, client: AsyncClient):
     assert response.status_code == 204
 
 
+async def test_next_items(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    ids = (
+        await client.post(
+            "/workqueues/1/add_many",
+            json=[{"reference": "a"}, {"reference": "b"}, {"reference": "c"}],
+        )
+    ).json()
+
+    response = await client.get("/workqueues/1/next_items?count=2")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [item["id"] for item in data] == [1, ids[0]]
+    assert all(item["status"] == WorkItemStatus.IN_PROGRESS for item in data)
+    assert all(item["locked"] is True for item in data)
+    assert all(item["started_at"] is not None for item in data)
+
+    response = await client.get("/workqueues/1/next_items?count=10")
+    assert [item["id"] for item in response.json()] == ids[1:]
+
+    response = await client.get("/workqueues/1/next_items")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_next_items_by_priority(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    ids = (
+        await client.post(
+            "/workqueues/1/add_many",
+            json=[
+                {"reference": "bulk"},
+                {"reference": "urgent", "priority": 10},
+                {"reference": "low", "priority": -1},
+                {"reference": "urgent too", "priority": 10},
+            ],
+        )
+    ).json()
+
+    response = await client.get("/workqueues/1/next_items?count=3")
+    data = response.json()
+    assert [item["id"] for item in data] == [ids[1], ids[3], 1]
+    assert [item["priority"] for item in data] == [10, 10, 0]
+
+    # Raising the priority of a queued item moves it ahead
+    response = await client.put(f"/workitems/{ids[2]}", json={"priority": 5})
+    assert response.json()["priority"] == 5
+
+    response = await client.get("/workqueues/1/next_item")
+    assert response.json()["id"] == ids[2]
+
+    response = await client.post(
+        "/workqueues/1/add", json={"reference": "x", "priority": 2**31}
+    )
+    assert response.status_code == 422
+
+
+async def test_delayed_workitems(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    # Drain the only NEW item
+    await client.get("/workqueues/1/next_item")
+
+    later = (datetime.now() + timedelta(hours=1)).isoformat()
+    ids = (
+        await client.post(
+            "/workqueues/1/add_many",
+            json=[
+                {"reference": "later", "not_before": later},
+                {"reference": "due", "not_before": "2000-01-01T00:00:00+00:00"},
+            ],
+        )
+    ).json()
+
+    response = await client.get("/workqueues/1/next_items?count=10")
+    assert [item["id"] for item in response.json()] == [ids[1]]
+    assert response.json()[0]["not_before"] is None
+    # Only the claimed item is released
+    response = await client.get(f"/workitems/{ids[0]}")
+    assert response.json()["not_before"] is not None
+
+    # A failed item is retried after the delay instead of right away
+    response = await client.put(
+        f"/workitems/{ids[1]}/requeue",
+        json={"delay_seconds": 60, "message": "Portal down"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == WorkItemStatus.NEW
+    assert data["locked"] is False
+    assert data["message"] == "Portal down"
+    assert data["not_before"] is not None
+
+    response = await client.get("/workqueues/1/next_items?count=10")
+    assert response.json() == []
+
+    await session.execute(
+        update(WorkItem)
+        .where(WorkItem.id.in_(ids))
+        .values(not_before=datetime.now() - timedelta(seconds=1))
+    )
+    await session.commit()
+
+    released = await WorkqueueRepository(session).release_delayed_items()
+    assert released == {1: 2}
+
+    response = await client.get("/workqueues/1/next_items?count=10")
+    assert sorted(item["id"] for item in response.json()) == ids
+
+    response = await client.put(
+        f"/workitems/{ids[0]}/requeue", json={"delay_seconds": -1}
+    )
+    assert response.status_code == 422
+
+
+async def test_retry_failed_items(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+    repository = WorkqueueRepository(session)
+
+    response = await client.post(
+        "/workqueues",
+        json={
+            "name": "Flaky portal",
+            "description": "",
+            "enabled": True,
+            "max_attempts": 3,
+            "retry_backoff_seconds": 10,
+        },
+    )
+    assert response.json()["max_attempts"] == 3
+    queue_id = response.json()["id"]
+    [item_id] = (
+        await client.post(f"/workqueues/{queue_id}/add_many", json=[{}])
+    ).json()
+
+    delays = []
+    for attempt in range(1, 4):
+        item = (await client.get(f"/workqueues/{queue_id}/next_item")).json()
+        assert item["id"] == item_id
+        assert item["attempts"] == attempt
+        await client.put(f"/workitems/{item_id}/status", json={"status": "failed"})
+
+        retried = await repository.retry_failed_items()
+        item = (await client.get(f"/workitems/{item_id}")).json()
+        if attempt == 3:
+            # Out of attempts: the item stays failed
+            assert retried == {}
+            assert item["status"] == WorkItemStatus.FAILED
+            break
+
+        assert retried == {queue_id: 1}
+        assert item["status"] == WorkItemStatus.NEW
+        not_before = datetime.fromisoformat(item["not_before"])
+        delays.append((not_before - datetime.now()).total_seconds())
+
+        # Not dequeued before its backoff has passed
+        response = await client.get(f"/workqueues/{queue_id}/next_item")
+        assert response.status_code == 204
+        await session.execute(
+            update(WorkItem)
+            .where(WorkItem.id == item_id)
+            .values(not_before=datetime.now())
+        )
+        await session.commit()
+
+    assert 8 < delays[0] <= 10
+    assert 18 < delays[1] <= 20
+
+
+async def test_retry_skips_failures_before_policy(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+    repository = WorkqueueRepository(session)
+
+    response = await client.post(
+        "/workqueues", json={"name": "Legacy", "description": "", "enabled": True}
+    )
+    queue_id = response.json()["id"]
+    [old_id, new_id] = (
+        await client.post(f"/workqueues/{queue_id}/add_many", json=[{}, {}])
+    ).json()
+
+    # Fails long before retries are enabled
+    await client.get(f"/workqueues/{queue_id}/next_item")
+    await client.put(f"/workitems/{old_id}/status", json={"status": "failed"})
+
+    response = await client.put(
+        f"/workqueues/{queue_id}",
+        json={"name": "Legacy", "description": "", "enabled": True, "max_attempts": 3},
+    )
+    assert response.status_code == 200
+    assert await repository.retry_failed_items() == {}
+
+    # Fails under the policy
+    await client.get(f"/workqueues/{queue_id}/next_item")
+    await client.put(f"/workitems/{new_id}/status", json={"status": "failed"})
+    assert await repository.retry_failed_items() == {queue_id: 1}
+
+    response = await client.get(f"/workitems/{old_id}")
+    assert response.json()["status"] == WorkItemStatus.FAILED
+
+
+async def test_next_item_waits_for_enqueue(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    # Drain the only NEW item
+    response = await client.get("/workqueues/1/next_item")
+    assert response.status_code == 200
+
+    waiter = asyncio.create_task(client.get("/workqueues/1/next_item?wait=5"))
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+
+    response = await client.post("/workqueues/1/add", json={"reference": "Late item"})
+    assert response.status_code == 200
+
+    response = await asyncio.wait_for(waiter, timeout=5)
+    assert response.status_code == 200
+    assert response.json()["reference"] == "Late item"
+
+
+async def test_next_item_waits_for_status_reset(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.get("/workqueues/1/next_item")
+    assert response.status_code == 200
+    item_id = response.json()["id"]
+
+    waiter = asyncio.create_task(client.get("/workqueues/1/next_item?wait=5"))
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+
+    response = await client.put(f"/workitems/{item_id}/status", json={"status": "new"})
+    assert response.status_code == 200
+
+    response = await asyncio.wait_for(waiter, timeout=5)
+    assert response.status_code == 200
+    assert response.json()["id"] == item_id
+
+
+async def test_notifier_reconnects_after_connection_loss(
+    session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(workqueue_notifier_module, "RECONNECT_DELAY_MIN", 0)
+    notifier = WorkqueueNotifier()
+    await notifier.start()
+    try:
+        lost = notifier._connection
+        assert lost is not None
+
+        with notifier.subscribe(1) as event:
+            lost.terminate()
+            await asyncio.sleep(0.1)
+            await asyncio.wait_for(notifier._reconnect_task, timeout=5)
+
+            # Waiters recheck their queue once the listener is back
+            assert event.is_set()
+
+        assert notifier._connection is not None
+        assert notifier._connection is not lost
+    finally:
+        await notifier.stop()
+
+
+async def test_next_item_wait_times_out(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    response = await client.get("/workqueues/1/next_item")
+    assert response.status_code == 200
+
+    response = await client.get("/workqueues/1/next_item?wait=0.2")
+    assert response.status_code == 204
+
+
 async def test_next_item_disabled_queue(session: AsyncSession, client: AsyncClient):
     await generate_basic_data(session)
 
@@ -294,6 +712,100 @@ async def test_workitems_paging_with_search(session: AsyncSession, client: Async
     assert data["total_items"] == 5
 
 
+async def test_workitems_fulltext_and_data_filters(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.post(
+        "/workqueues/1/add_many",
+        json=[
+            {"data": {"case": "SAG-2024-118", "amount": 250}, "reference": "first"},
+            {"data": {"case": "SAG-2024-119", "tags": ["urgent"]}, "reference": "x"},
+            {"data": {"case": "SAG-2024-120"}, "reference": "citizen 118"},
+        ],
+    )
+    assert response.status_code == 200
+
+    # Matches whole words, not substrings: "118" is not a word of "SAG-2024-118"
+    response = await client.get("/workqueues/1/items", params={"fulltext": "118"})
+    assert response.status_code == 200
+    assert [i["reference"] for i in response.json()["items"]] == ["citizen 118"]
+
+    response = await client.get(
+        "/workqueues/1/items", params={"fulltext": "SAG-2024-118"}
+    )
+    assert [i["reference"] for i in response.json()["items"]] == ["first"]
+
+    response = await client.get(
+        "/workqueues/1/items", params={"fulltext": "SAG-2024-119"}
+    )
+    assert [i["reference"] for i in response.json()["items"]] == ["x"]
+
+    response = await client.get(
+        "/workqueues/1/items", params={"data_contains": '{"tags": ["urgent"]}'}
+    )
+    data = response.json()
+    assert data["total_items"] == 1
+    assert data["items"][0]["reference"] == "x"
+
+    response = await client.get(
+        "/workqueues/1/items", params={"data_contains": '{"amount": 250}'}
+    )
+    assert [i["reference"] for i in response.json()["items"]] == ["first"]
+
+    # The estimated total is cached per filter value
+    for data_contains, total in [('{"amount": 250}', 1), ('{"amount": 1}', 0)]:
+        response = await client.get(
+            "/workqueues/1/items",
+            params={"data_contains": data_contains, "total": "estimated"},
+        )
+        assert response.status_code == 200
+        assert response.json()["total_items"] == total
+
+
+async def test_workitems_data_filter_must_be_object(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    for value in ["not json", "[1, 2]"]:
+        response = await client.get(
+            "/workqueues/1/items", params={"data_contains": value}
+        )
+        assert response.status_code == 400
+
+
+async def test_workitems_keyset_paging(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    response = await client.get("/workqueues/1/items?size=2")
+    assert response.status_code == 200
+    data = response.json()
+    seen = [item["id"] for item in data["items"]]
+
+    while data["next_cursor"]:
+        response = await client.get(
+            "/workqueues/1/items", params={"size": 2, "after": data["next_cursor"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_items"] == 5
+        seen += [item["id"] for item in data["items"]]
+
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+    assert len(seen) == 5
+
+
+async def test_workitems_keyset_paging_invalid_cursor(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.get("/workqueues/1/items?after=not-a-cursor")
+    assert response.status_code == 400
+
+
 async def test_get_workitems_by_reference_in_workqueue(
     session: AsyncSession, client: AsyncClient
 ):
@@ -396,6 +908,187 @@ async def test_get_workitems_by_reference_in_workqueue_with_status_filter(
     assert len(data) == 0
 
 
+async def test_get_workitems_by_references_in_workqueue(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    response = await client.post(
+        "/workqueues/1/add_many", json=[{"reference": "other"}]
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/workqueues/1/by_references",
+        json=["Embedded workitem", "other", "missing", " "],
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert set(data) == {"Embedded workitem", "other", "missing"}
+    assert len(data["Embedded workitem"]) == 5
+    assert all(item["workqueue_id"] == 1 for item in data["Embedded workitem"])
+    assert [item["reference"] for item in data["other"]] == ["other"]
+    assert data["missing"] == []
+
+    response = await client.post(
+        "/workqueues/1/by_references?status=completed",
+        json=["Embedded workitem", "other"],
+    )
+    data = response.json()
+    assert [item["status"] for item in data["Embedded workitem"]] == [
+        WorkItemStatus.COMPLETED
+    ]
+    assert data["other"] == []
+
+
+async def test_export_workitems(
+    session: AsyncSession, client: AsyncClient, monkeypatch
+):
+    await generate_basic_data(session)
+    monkeypatch.setattr(workqueue_service, "EXPORT_BATCH_SIZE", 2)
+
+    response = await client.get("/workqueues/1/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="workqueue-1.ndjson"' in response.headers["content-disposition"]
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 5
+    assert all(row["workqueue_id"] == 1 for row in rows)
+    assert [row["updated_at"] for row in rows] == sorted(
+        (row["updated_at"] for row in rows), reverse=True
+    )
+
+    response = await client.get("/workqueues/1/export?format=csv&status=completed")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["status"] == WorkItemStatus.COMPLETED
+    assert json.loads(rows[0]["data"]) == {}
+
+    response = await client.get(
+        "/workqueues/1/export", params={"created_after": "2999-01-01T00:00:00"}
+    )
+    assert response.text == ""
+
+    response = await client.get("/workqueues/1/export?format=xml")
+    assert response.status_code == 422
+
+
+async def test_import_workitems(
+    session: AsyncSession, client: AsyncClient, monkeypatch
+):
+    await generate_basic_data(session)
+    monkeypatch.setattr(workqueue_service, "IMPORT_BATCH_SIZE", 2)
+
+    body = "\n".join(
+        [
+            json.dumps({"reference": "import-1", "data": {"n": 1}}),
+            "not json",
+            json.dumps({"reference": "import-2"}),
+            "",
+            json.dumps({"data": [1]}),
+            json.dumps({"reference": "import-3"}),
+        ]
+    )
+    response = await client.post("/workqueues/1/import", content=body)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["imported"] == 3
+    assert data["failed"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 5]
+    assert data["errors"][1]["error"].startswith("data:")
+
+    response = await client.post(
+        "/workqueues/1/by_references", json=["import-1", "import-3"]
+    )
+    items = response.json()
+    assert items["import-1"][0]["data"] == {"n": 1}
+    assert items["import-1"][0]["status"] == WorkItemStatus.NEW
+    assert len(items["import-3"]) == 1
+
+    # An export can be imported again; its extra columns are ignored
+    exported = await client.get("/workqueues/1/export?format=csv&status=completed")
+    response = await client.post(
+        "/workqueues/1/import?format=csv", content=exported.text + "a,b\n"
+    )
+    assert response.json()["imported"] == 1
+    assert response.json()["failed"] == 1
+
+    response = await client.post(
+        "/workqueues/1/import?format=csv", content="id,status\n1,new\n"
+    )
+    assert response.status_code == 400
+
+
+async def test_import_workitems_multiline_csv(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+
+    # Round trip a reference with an embedded newline through export and import
+    response = await client.post(
+        "/workqueues", json={"name": "Source", "description": "", "enabled": True}
+    )
+    source_id = response.json()["id"]
+    await client.post(f"/workqueues/{source_id}/add", json={"reference": "two\nlines"})
+    exported = await client.get(f"/workqueues/{source_id}/export?format=csv")
+    response = await client.post(
+        "/workqueues/1/import?format=csv",
+        content=exported.text + 'after,"{}"\nbroken,"{\n',
+    )
+    data = response.json()
+    assert data["imported"] == 1
+    assert data["failed"] == 2
+    assert [error["line"] for error in data["errors"]] == [4, 5]
+    assert data["errors"][1]["error"] == "Unterminated quoted field"
+
+    response = await client.post("/workqueues/1/by_references", json=["two\nlines"])
+    assert len(response.json()["two\nlines"]) == 1
+
+
+async def test_import_workitems_unterminated_quote(
+    session: AsyncSession, client: AsyncClient, monkeypatch
+):
+    await generate_basic_data(session)
+    monkeypatch.setattr(workqueue_service, "MAX_IMPORT_RECORD_LINES", 3)
+    monkeypatch.setattr(workqueue_service, "MAX_IMPORT_RECORD_SIZE", 50)
+
+    rows = [f'row {i},"{{}}"' for i in range(5)]
+    content = "\n".join(
+        ["reference,data", '"broken,"{}"', *rows, "x" * 60, "last,{}", '"open']
+    )
+    response = await client.post("/workqueues/1/import?format=csv", content=content)
+    data = response.json()
+    assert data["imported"] == 6
+    assert data["failed"] == 3
+    assert [(error["line"], error["error"]) for error in data["errors"]] == [
+        (2, "Unterminated quoted field"),
+        (8, "Line exceeds 50 characters"),
+        (10, "Unterminated quoted field"),
+    ]
+
+    response = await client.post(
+        "/workqueues/1/by_references", json=["row 0", "row 4", "last"]
+    )
+    assert all(len(items) == 1 for items in response.json().values())
+
+
+async def test_import_lines_split_across_chunks(monkeypatch):
+    monkeypatch.setattr(workqueue_service, "MAX_IMPORT_RECORD_SIZE", 8)
+
+    async def chunks():
+        for chunk in (b"ab", b"c\nd", b"efghijkl", b"mnop\r\nq", b"r"):
+            yield chunk
+
+    lines = [line async for line in workqueue_service._iter_lines(chunks())]
+    assert lines == ["abc", None, "qr"]
+
+
 async def test_create_workqueue_with_auto_clean(
     session: AsyncSession, client: AsyncClient
 ):
@@ -533,6 +1226,47 @@ async def test_auto_clean_workqueues(session: AsyncSession, client: AsyncClient)
     assert audit_log.workitem_id is None
 
 
+async def test_auto_clean_resumes_in_batches(
+    session: AsyncSession, client: AsyncClient
+):
+    await generate_basic_data(session)
+    await session.execute(
+        update(Workqueue).where(Workqueue.id == 1).values(auto_clean_max_age_days=30)
+    )
+    old_date = datetime.now() - timedelta(days=40)
+    for index in range(5):
+        session.add(
+            WorkItem(
+                status=WorkItemStatus.COMPLETED,
+                data={},
+                reference=f"Old item {index}",
+                locked=False,
+                workqueue_id=1,
+                updated_at=old_date,
+            )
+        )
+    await session.commit()
+
+    service = WorkqueueService(WorkqueueRepository(session))
+    progress = AutoCleanProgress()
+
+    # A zero budget stops after every batch; each run picks up where it left off
+    runs = 1
+    while not await service.auto_clean_workqueues(
+        progress, time_budget=0, batch_size=2
+    ):
+        assert progress.in_progress
+        runs += 1
+
+    assert runs == 3
+    assert not progress.in_progress
+
+    response = await client.get("/workqueues/1/items", params={"search": "Old item"})
+    assert response.json()["total_items"] == 0
+    response = await client.get("/workqueues/1/items")
+    assert response.json()["total_items"] == 5
+
+
 async def test_auto_clean_skips_workqueues_without_setting(
     session: AsyncSession, client: AsyncClient
 ):
@@ -549,3 +1283,60 @@ async def test_auto_clean_skips_workqueues_without_setting(
 
     response = await client.get("/workqueues/1/items")
     assert response.json()["total_items"] == 5
+
+
+async def test_next_item_sets_lease(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    await session.execute(
+        update(Workqueue).where(Workqueue.id == 1).values(lease_seconds=300)
+    )
+    await session.commit()
+
+    response = await client.get("/workqueues/1/next_item")
+    assert response.status_code == 200
+
+    lease_until = datetime.fromisoformat(response.json()["lease_until"])
+    assert datetime.now() < lease_until <= datetime.now() + timedelta(seconds=300)
+
+
+async def test_next_item_without_lease(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    response = await client.get("/workqueues/1/next_item")
+    assert response.status_code == 200
+    assert response.json()["lease_until"] is None
+
+
+async def test_requeue_expired_leases(session: AsyncSession, client: AsyncClient):
+    await generate_basic_data(session)
+
+    # Item 2 is IN_PROGRESS with an expired lease; item 1 is claimed with a live one
+    await session.execute(
+        update(WorkItem)
+        .where(WorkItem.id == 2)
+        .values(locked=True, lease_until=datetime.now() - timedelta(minutes=1))
+    )
+    await session.execute(
+        update(WorkItem)
+        .where(WorkItem.id == 1)
+        .values(
+            status=WorkItemStatus.IN_PROGRESS,
+            locked=True,
+            lease_until=datetime.now() + timedelta(minutes=5),
+        )
+    )
+    await session.commit()
+
+    service = WorkqueueService(WorkqueueRepository(session))
+    await service.requeue_expired_leases()
+    session.expire_all()
+
+    requeued = await session.get(WorkItem, 2)
+    assert requeued.status == WorkItemStatus.NEW
+    assert requeued.locked is False
+    assert requeued.lease_until is None
+
+    leased = await session.get(WorkItem, 1)
+    assert leased.status == WorkItemStatus.IN_PROGRESS
+    assert leased.locked is True